@@ -0,0 +1,96 @@
+from ai_summarizer import summarize_items
+import os
+import queue
+import metrics
+import threading
+import time
+
+# 每个新闻源的最长抓取时间（秒），所有来源同时开始，因此也是整体等待上限
+SOURCE_TIMEOUT = float(os.getenv('SOURCE_TIMEOUT', '120'))
+# 流式抓取时每个来源最多预先抓取的新闻条数
+PREFETCH_SIZE = int(os.getenv('SOURCE_PREFETCH_SIZE', '5'))
+
+_STREAM_END = object()
+
+
+def _source_name(source):
+    return source.__name__ if isinstance(source, type) else source.__class__.__name__
+
+
+class SourceStream:
+    """在后台线程中运行某个来源的 iter_news()，通过有界队列逐条提供新闻
+
+    各来源同时开始抓取；队列满时来源暂停，消费者 close() 后来源停止，
+    不会再抓取不需要的文章。on_news 在来源每产出一条新闻时（于抓取线程中）调用，
+    不必等待归并，用于边抓取边展示。
+    """
+
+    def __init__(self, source, timeout=SOURCE_TIMEOUT, buffer_size=PREFETCH_SIZE, on_news=None):
+        self.name = _source_name(source)
+        self.timeout = timeout
+        self.on_news = on_news
+        self._queue = queue.Queue(maxsize=buffer_size)
+        self._stop = threading.Event()
+        self._started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, args=(source,), name=f'stream-{self.name}', daemon=True)
+        self._thread.start()
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, source):
+        try:
+            with metrics.span('fetch_source', source=self.name):
+                scraper = source() if isinstance(source, type) else source
+                news_iter = scraper.iter_news()
+                try:
+                    for news in news_iter:
+                        if news.source is None:
+                            news.source = self.name
+                        metrics.count(metrics.SOURCE_ITEMS, source=self.name)
+                        if self.on_news is not None:
+                            self.on_news(news)
+                        if not self._put(news):
+                            break
+                finally:
+                    news_iter.close()
+        except Exception as e:
+            print(f"Error getting news from {self.name}: {e}")
+        finally:
+            self._put(_STREAM_END)
+
+    def __iter__(self):
+        while True:
+            remaining = self.timeout - (time.monotonic() - self._started_at)
+            try:
+                news = self._queue.get(timeout=max(remaining, 0))
+            except queue.Empty:
+                print(f"Timeout getting news from {self.name} after {self.timeout}s")
+                metrics.count(metrics.STAGE_FAILURES, stage='fetch_source', source=self.name)
+                return
+            if news is _STREAM_END:
+                return
+            yield news
+
+    def close(self):
+        self._stop.set()
+
+
+def collect_top_news(sources, processor, is_morning=True, on_news=None):
+    """流式合并各来源的新闻，选出时间窗口内最新的若干条，只为入选的新闻生成摘要"""
+    streams = [SourceStream(source, on_news=on_news) for source in sources]
+    try:
+        with metrics.span('select_top_news'):
+            top_news = processor.select_top_news(streams, is_morning)
+    finally:
+        for stream in streams:
+            stream.close()
+    
+    summarize_items(top_news)
+    return top_news
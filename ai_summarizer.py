@@ -0,0 +1,176 @@
+from functools import lru_cache
+from openai import OpenAI
+from dotenv import load_dotenv
+import json
+import os
+import time
+import metrics
+from llm_executor import get_llm_executor
+from summary_cache import get_summary_cache
+
+# 加载环境变量
+load_dotenv()
+
+SUMMARY_MODEL = "gpt-3.5-turbo"
+SUMMARY_SYSTEM_PROMPT = "你是一个专业的新闻摘要生成器，请用50字以内概括新闻内容"
+BATCH_SYSTEM_PROMPT = (
+    SUMMARY_SYSTEM_PROMPT + "。你会收到多篇带编号的新闻，"
+    "请按编号顺序返回一个 JSON 字符串数组，第 N 个元素是第 N 篇新闻的摘要，不要输出数组以外的任何内容"
+)
+FALLBACK_SUMMARY = "暂无摘要"
+
+# 每次请求打包的文章数，以及每篇文章送入模型的最大字数（逐条和批量请求相同）
+BATCH_SIZE = int(os.getenv('SUMMARY_BATCH_SIZE', '10'))
+MAX_CONTENT_CHARS = int(os.getenv('SUMMARY_MAX_CONTENT_CHARS', '1500'))
+# 摘要缓存键中的提示词部分：一篇文章走逐条还是批量请求取决于当次待生成的数量，
+# 两种提示词都计入，任一修改都会使缓存失效
+CACHE_PROMPT = SUMMARY_SYSTEM_PROMPT + '\0' + BATCH_SYSTEM_PROMPT
+
+
+@lru_cache(maxsize=None)
+def get_openai_client():
+    """进程内共用一个 OpenAI 客户端，复用其连接池"""
+    return OpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"),
+        base_url=os.getenv("OPENAI_BASE_URL"),
+        # 重试由 LLMExecutor 统一处理
+        max_retries=0
+    )
+
+
+class AISummarizer:
+    def __init__(self, batch_size=BATCH_SIZE):
+        self.client = get_openai_client()
+        self.batch_size = batch_size
+        self.cache = get_summary_cache()
+        # 并发、重试、限速由共享的执行器负责
+        self.executor = get_llm_executor()
+
+    def _cache_key(self, content):
+        # 按实际送入模型的（截断后的）正文计算
+        return self.cache.make_key(content[:MAX_CONTENT_CHARS], SUMMARY_MODEL, CACHE_PROMPT)
+
+    def generate_summary(self, content):
+        key = self._cache_key(content)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        summary = self._request_summary(content)
+        if summary != FALLBACK_SUMMARY:
+            self.cache.set(key, summary)
+        return summary
+
+    def _request_summary(self, content):
+        try:
+            with metrics.span('summary_request', kind='single'):
+                response = self.executor.chat(
+                    self.client,
+                    model=SUMMARY_MODEL,
+                    messages=[
+                        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+                        {"role": "user", "content": f"请为以下新闻生成摘要：\n{content[:MAX_CONTENT_CHARS]}"}
+                    ],
+                    max_tokens=60
+                )
+            return response.choices[0].message.content.strip()
+        except Exception as e:
+            print(f"Error generating summary: {e}")
+            return FALLBACK_SUMMARY
+
+    def generate_summaries(self, contents):
+        """批量生成摘要，返回与 contents 一一对应的摘要列表"""
+        contents = list(contents)
+        keys = [self._cache_key(content) for content in contents]
+        summaries = self.cache.get_many(keys)
+
+        # 只为缓存中没有的文章请求 API，相同内容只请求一次
+        pending = {}
+        for key, content in zip(keys, contents):
+            if key not in summaries:
+                pending.setdefault(key, content)
+        if pending:
+            print(f"Summary cache: {len(summaries)} hits, {len(pending)} to generate")
+        # 各批次并发请求，某一批失败或变慢不影响其他批次
+        pending_keys = list(pending)
+        key_batches = [pending_keys[start:start + self.batch_size]
+                       for start in range(0, len(pending_keys), self.batch_size)]
+        results = self.executor.map(
+            lambda batch_keys: self._summarize_batch([pending[key] for key in batch_keys]), key_batches
+        )
+        generated = {}
+        for batch_keys, batch_summaries in zip(key_batches, results):
+            generated.update(zip(batch_keys, batch_summaries))
+
+        self.cache.set_many({key: summary for key, summary in generated.items() if summary != FALLBACK_SUMMARY})
+        summaries.update(generated)
+        return [summaries[key] for key in keys]
+
+    def summarize_items(self, news_items):
+        """为新闻条目批量生成摘要，用摘要替换条目中临时保存的正文"""
+        contents = [news.content or '' for news in news_items]
+        for news in news_items:
+            news.content = None
+        start = time.perf_counter()
+        with metrics.span('summarize_items'):
+            summaries = self.generate_summaries(contents)
+        if news_items:
+            # 按条目平均的摘要耗时（批量请求无法拆分到单条）
+            elapsed = (time.perf_counter() - start) / len(news_items)
+            for news in news_items:
+                metrics.observe(metrics.STAGE_SECONDS, elapsed, stage='summary_per_item', source=news.source)
+        for news, summary in zip(news_items, summaries):
+            news.summary = summary
+
+    def _summarize_batch(self, batch):
+        if len(batch) == 1:
+            return [self._request_summary(batch[0])]
+
+        articles = "\n\n".join(
+            f"[{i}]\n{content[:MAX_CONTENT_CHARS]}" for i, content in enumerate(batch, 1)
+        )
+        try:
+            with metrics.span('summary_request', kind='batch'):
+                response = self.executor.chat(
+                    self.client,
+                    model=SUMMARY_MODEL,
+                    messages=[
+                        {"role": "system", "content": BATCH_SYSTEM_PROMPT},
+                        {"role": "user", "content": f"请为以下{len(batch)}篇新闻分别生成摘要：\n\n{articles}"}
+                    ],
+                    max_tokens=80 * len(batch)
+                )
+            summaries = self._parse_batch(response.choices[0].message.content, len(batch))
+        except Exception as e:
+            print(f"Error generating batch summaries: {e}")
+            return [FALLBACK_SUMMARY] * len(batch)
+
+        if summaries is None:
+            # 模型没有按格式返回时退回逐条生成
+            print("Batch summary response malformed, falling back to per-item summaries")
+            return [self._request_summary(content) for content in batch]
+        return summaries
+
+    @staticmethod
+    def _parse_batch(text, expected):
+        """解析模型返回的 JSON 数组，数量或格式不符时返回 None"""
+        start, end = text.find('['), text.rfind(']')
+        if start == -1 or end <= start:
+            return None
+        try:
+            summaries = json.loads(text[start:end + 1])
+        except ValueError:
+            return None
+        if not isinstance(summaries, list) or len(summaries) != expected:
+            return None
+        return [str(summary).strip() or FALLBACK_SUMMARY for summary in summaries]
+
+
+def summarize_items(news_items):
+    """为新闻条目生成摘要；没有配置 OpenAI（如未设置 OPENAI_API_KEY）或生成出错时保留不带摘要的条目"""
+    try:
+        AISummarizer().summarize_items(news_items)
+    except Exception as e:
+        print(f"AI summarization unavailable, keeping news without summaries: {e}")
+        for news in news_items:
+            news.content = None
@@ -1,22 +1,46 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 import sys
 import os
+import json
+import queue
+import threading
 
-# 添加 src 目录到 Python 路径
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+# 添加项目根目录到 Python 路径，以使用共享模块
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from scraper import MeadinScraper
-from traveldaily_scraper import TravelDailyScraper
-from news_processor import NewsProcessor
-from summarizer import NewsSummarizer
+# 抓取、摘要相关的模块（selenium、openai、bs4 等）较重，只在需要的路由中导入，
+# 冷启动和首页不必为它们付出导入时间
+from response_cache import StaleWhileRevalidateCache
+
+# 迈点网抓取器：都先直接请求列表页，只在页面需要 JS 时启动浏览器；http（默认）使用
+# FETCH_BROWSER_BACKEND 指定的浏览器，selenium / playwright 固定使用对应的浏览器
+MEADIN_SCRAPER = os.getenv('MEADIN_SCRAPER', 'http')
+
+# Serverless 函数中默认不启动浏览器，只用 HTTP 抓取；有浏览器的部署可设置
+# FETCH_BROWSER_BACKEND=selenium 或 playwright。须在导入 tiered_fetcher 之前设置
+os.environ.setdefault('FETCH_BROWSER_BACKEND', 'none')
 
 app = Flask(__name__)
 
+# /api/news 响应缓存，页面访问直接命中缓存而不是每次都重新抓取
+news_cache = StaleWhileRevalidateCache()
+
 class NewsAggregator:
     def __init__(self):
-        self.scrapers = [
-            MeadinScraper(),
-            TravelDailyScraper()
+        from news_processor import NewsProcessor
+        from summarizer import NewsSummarizer
+        from traveldaily_scraper import TravelDailyScraper
+        if MEADIN_SCRAPER == 'selenium':
+            from scraper import MeadinScraper
+        elif MEADIN_SCRAPER == 'playwright':
+            from scraper_playwright import MeadinScraper
+        else:
+            from meadin_http_scraper import MeadinScraper
+        
+        # 注册的新闻源，抓取时在各自线程中实例化并同时运行
+        self.sources = [
+            MeadinScraper,
+            TravelDailyScraper
         ]
         self.processor = NewsProcessor()
         try:
@@ -26,78 +50,163 @@ class NewsAggregator:
             print("Warning: OpenAI API key not found, running without AI summarization")
             self.use_ai = False
 
-    def get_news_summary(self):
-        # 从多个来源获取新闻
-        news_items = []
-        for scraper in self.scrapers:
-            try:
-                items = scraper.get_news()
-                if items:
-                    news_items.extend(items)
-            except Exception as e:
-                print(f"Error getting news from {scraper.__class__.__name__}: {e}")
+    def fetch_top_news(self, is_morning=True, on_news=None):
+        """流式归并各来源，只抓取并摘要进入前10的新闻"""
+        from aggregator import collect_top_news
+        return collect_top_news(self.sources, self.processor, is_morning, on_news)
+
+    def get_news_report(self, is_morning=True):
+        """抓取、过滤并生成报告，返回各格式的渲染结果"""
+        # 从多个来源获取最新的新闻
+        news_items = self.fetch_top_news(is_morning)
         
         # 过滤新闻
-        filtered_news = self.processor.filter_news(news_items)
-        
-        if not filtered_news:
-            return "暂无相关新闻"
+        filtered_news = self.processor.filter_news(news_items, is_morning)
         
         # 如果启用了AI摘要，使用AI生成摘要
-        if self.use_ai:
+        if filtered_news and self.use_ai:
             try:
-                return self.summarizer.summarize_news(filtered_news)
+                return self.summarizer.summarize_report(filtered_news, is_morning)
             except Exception as e:
                 print(f"AI summarization failed: {e}")
-                return self.processor.format_news_report(filtered_news)
+        return self.processor.render_report(filtered_news, is_morning)
+
+    def stream_news_summary(self, is_morning=True):
+        """get_news_report 的流式版本，AI 摘要逐段产出（markdown）"""
+        news_items = self.fetch_top_news(is_morning)
+        filtered_news = self.processor.filter_news(news_items, is_morning)
+        
+        if not filtered_news:
+            yield "暂无相关新闻"
+        elif self.use_ai:
+            yield from self.summarizer.summarize_news_stream(filtered_news, is_morning)
         else:
-            return self.processor.format_news_report(filtered_news)
+            yield self.processor.format_news_report(filtered_news, is_morning)
 
-@app.route('/api/news', methods=['GET'])
-def get_news():
-    try:
-        # 获取所有新闻
-        news_items = []
+_edition_scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_edition_scheduler():
+    """预生成的早报/晚报，首次使用时创建"""
+    global _edition_scheduler
+    with _scheduler_lock:
+        if _edition_scheduler is None:
+            from scheduler import EditionScheduler
+            _edition_scheduler = EditionScheduler(lambda is_morning: NewsAggregator().get_news_report(is_morning))
+        return _edition_scheduler
+
+# 设置 ENABLE_EDITION_SCHEDULER=1 时按时自动生成
+if os.getenv('ENABLE_EDITION_SCHEDULER') == '1':
+    get_edition_scheduler().start()
+
+EDITION_NAMES = {
+    'morning': '早报',
+    'evening': '晚报'
+}
+
+# ?format= 支持的格式及其响应类型；不指定时返回 JSON，包含 markdown 和服务端渲染的 HTML
+REPORT_CONTENT_TYPES = {
+    'html': 'text/html; charset=utf-8',
+    'text': 'text/plain; charset=utf-8',
+    'markdown': 'text/markdown; charset=utf-8'
+}
+
+def build_report(news_items):
+    """过滤新闻并渲染报告，返回各格式的渲染结果"""
+    from news_processor import NewsProcessor
+    processor = NewsProcessor()
+    filtered_news = processor.filter_news(news_items) if news_items else []
+    return processor.render_report(filtered_news)
+
+def build_news_report(on_news=None):
+    """抓取、过滤并渲染新闻，结果缓存后供 /api/news 的各种格式使用"""
+    # 并发获取所有来源（迈点网、环球旅讯）最新的新闻
+    news_items = NewsAggregator().fetch_top_news(on_news=on_news)
+    return build_report(news_items)
+
+def _report_payload(report):
+    return {
+        'success': True,
+        'data': report['markdown'],
+        'html': report['html']
+    }
+
+def report_response(report, fmt=None):
+    """按 format 参数返回已渲染的报告，不再重新渲染"""
+    if fmt is None:
+        return jsonify(_report_payload(report))
+    if fmt == 'json':
+        return jsonify({'success': True, 'data': report['json']})
+    if fmt in REPORT_CONTENT_TYPES:
+        return Response(report[fmt], content_type=REPORT_CONTENT_TYPES[fmt])
+    return jsonify({
+        'success': False,
+        'error': 'format must be one of html, text, markdown, json'
+    }), 400
+
+def stream_news():
+    """以 NDJSON 逐行输出报告
+
+    有缓存时立即输出（过期的缓存同时在后台刷新）；没有缓存时与 /api/news 共用一次合并的构建，
+    由本请求触发构建时，各来源每抓到一条新闻就立即输出（不等待最慢的来源），最后输出完整报告。
+    """
+    def generate():
+        from report_renderer import serialize_news
         
-        # 从迈点网获取新闻
-        try:
-            meadin_scraper = MeadinScraper()
-            meadin_news = meadin_scraper.get_news()
-            if meadin_news:
-                news_items.extend(meadin_news)
-        except Exception as e:
-            print(f"Error getting news from Meadin: {e}")
+        cached = news_cache.get_cached('news', build_news_report)
+        if cached is not None:
+            yield json.dumps({'type': 'report', **_report_payload(cached)}, ensure_ascii=False) + '\n'
+            return
         
-        # 从环球旅讯获取新闻
-        try:
-            traveldaily_scraper = TravelDailyScraper()
-            traveldaily_news = traveldaily_scraper.get_news()
-            if traveldaily_news:
-                news_items.extend(traveldaily_news)
-        except Exception as e:
-            print(f"Error getting news from TravelDaily: {e}")
+        events = queue.Queue()
+        result = {}
         
-        if not news_items:
-            return jsonify({
-                'success': True,
-                'data': "暂无相关新闻"
-            })
+        def build():
+            try:
+                result['report'] = news_cache.get('news', lambda: build_news_report(on_news=events.put))
+            except Exception as e:
+                result['error'] = e
+            finally:
+                events.put(None)
         
-        # 过滤和格式化新闻
-        processor = NewsProcessor()
-        filtered_news = processor.filter_news(news_items)
-        formatted_news = processor.format_news_report(filtered_news)
+        threading.Thread(target=build, name='stream-news', daemon=True).start()
+        for news in iter(events.get, None):
+            yield json.dumps({
+                'type': 'source',
+                'source': news.source,
+                'items': [serialize_news(news)]
+            }, ensure_ascii=False) + '\n'
         
-        if not formatted_news:
-            return jsonify({
-                'success': True,
-                'data': "暂无相关新闻"
-            })
-            
-        return jsonify({
-            'success': True,
-            'data': formatted_news
-        })
+        if 'error' in result:
+            print(f"Error in stream_news: {result['error']}")
+            payload = {
+                'success': False,
+                'error': str(result['error'])
+            }
+        else:
+            payload = _report_payload(result['report'])
+        yield json.dumps({'type': 'report', **payload}, ensure_ascii=False) + '\n'
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.route('/api/news', methods=['GET'])
+def get_news():
+    if request.args.get('stream') == '1':
+        return stream_news()
+    if request.args.get('digest') == 'stream':
+        # AI 摘要边生成边输出
+        return Response(
+            stream_with_context(NewsAggregator().stream_news_summary()),
+            mimetype='text/plain',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+        )
+    
+    try:
+        return report_response(news_cache.get('news', build_news_report), request.args.get('format'))
         
     except Exception as e:
         print(f"Error in get_news: {e}")
@@ -106,6 +215,33 @@ def get_news():
             'error': str(e)
         }), 500
 
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus 文本格式的运行指标：各阶段耗时、各来源新闻数、LLM 延迟与 token 用量、缓存命中等"""
+    import metrics
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+@app.route('/api/edition/<edition>', methods=['GET'])
+def get_edition(edition):
+    name = EDITION_NAMES.get(edition)
+    if not name:
+        return jsonify({
+            'success': False,
+            'error': 'edition must be morning or evening'
+        }), 404
+    
+    try:
+        from report_renderer import ensure_rendered
+        report = get_edition_scheduler().get_or_build(name)
+        return report_response(ensure_rendered(report), request.args.get('format'))
+        
+    except Exception as e:
+        print(f"Error in get_edition: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.route('/')
 def home():
     return '''
@@ -122,7 +258,6 @@ def home():
                     background-color: #f8f9fa;
                 }
                 .news-container {
-                    white-space: pre-wrap;
                     font-family: 'Microsoft YaHei', sans-serif;
                     line-height: 1.8;
                 }
@@ -191,7 +326,9 @@ def home():
                 <div class="text-center mt-4 footer">
                     <div class="divider"></div>
                     <p>API 接口说明：</p>
-                    <code>GET /api/news</code> - 获取最新酒店资讯
+                    <code>GET /api/news</code> - 获取最新酒店资讯（<code>?stream=1</code> 以 NDJSON 逐步返回，<code>?digest=stream</code> 流式返回 AI 摘要，<code>?format=html|text|markdown|json</code> 指定报告格式）<br>
+                    <code>GET /api/edition/morning</code> / <code>GET /api/edition/evening</code> - 获取预生成的早报/晚报<br>
+                    <code>GET /api/metrics</code> - Prometheus 格式的运行指标
                 </div>
             </div>
 
@@ -202,34 +339,71 @@ def home():
                     const getNewsBtn = document.getElementById('getNewsBtn');
                     const copyNewsBtn = document.getElementById('copyNewsBtn');
 
+                    function escapeHtml(text) {
+                        const div = document.createElement('div');
+                        div.textContent = text;
+                        return div.innerHTML;
+                    }
+
+                    function renderReport(html) {
+                        // 报告由服务端渲染为 HTML
+                        newsContent.innerHTML = html;
+                    }
+
+                    let sourceSections = {};
+
+                    function renderSource(source, items) {
+                        // 各来源抓到的新闻先行展示，完整报告到达后替换
+                        let section = sourceSections[source];
+                        if (!section) {
+                            section = sourceSections[source] = document.createElement('div');
+                            section.className = 'mb-3';
+                            section.innerHTML = '<h5 class="text-muted">' + escapeHtml(source) + '</h5>';
+                            newsContent.appendChild(section);
+                        }
+                        section.insertAdjacentHTML('beforeend', items.map(item => '<div>' + (item.url
+                            ? '<a href="' + escapeHtml(item.url) + '" target="_blank">' + escapeHtml(item.title) + '</a>'
+                            : escapeHtml(item.title)) + '</div>').join(''));
+                    }
+
+                    function handleEvent(event) {
+                        if (event.type === 'source') {
+                            renderSource(event.source, event.items);
+                        } else if (event.type === 'report') {
+                            if (event.success) {
+                                renderReport(event.html);
+                            } else {
+                                newsContent.innerHTML = '<div class="alert alert-danger">获取新闻失败：' + escapeHtml(event.error) + '</div>';
+                            }
+                        }
+                    }
+
                     async function getNews() {
                         try {
                             loading.style.display = 'block';
                             newsContent.innerHTML = '';
+                            sourceSections = {};
                             
-                            const response = await fetch('/api/news');
-                            const data = await response.json();
+                            const response = await fetch('/api/news?stream=1');
+                            const reader = response.body.getReader();
+                            const decoder = new TextDecoder();
+                            let buffer = '';
                             
-                            if (data.success) {
-                                let content = data.data;
-                                if (content === "暂无相关新闻") {
-                                    newsContent.innerHTML = '<div class="alert alert-info">暂无相关新闻</div>';
-                                } else {
-                                    content = content
-                                        .split('# ').join('<h1 class="mb-4">')
-                                        .split('\n').join('<br>')
-                                        .replace(/(\d+)\. /g, '<h3 class="mt-4">$1. ')
-                                        .replace(/\[原文链接\]/g, '<a href="')
-                                        .replace(/\)/g, '" target="_blank" class="text-primary">原文链接</a>')
-                                        .replace(/------/g, '<hr class="my-4">');
-                                    
-                                    newsContent.innerHTML = content;
+                            while (true) {
+                                const { done, value } = await reader.read();
+                                buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+                                const lines = buffer.split('\\n');
+                                buffer = lines.pop();
+                                lines.filter(line => line.trim()).forEach(line => handleEvent(JSON.parse(line)));
+                                if (done) {
+                                    break;
                                 }
-                            } else {
-                                newsContent.innerHTML = '<div class="alert alert-danger">获取新闻失败：' + data.error + '</div>';
+                            }
+                            if (buffer.trim()) {
+                                handleEvent(JSON.parse(buffer));
                             }
                         } catch (error) {
-                            newsContent.innerHTML = '<div class="alert alert-danger">获取新闻失败：' + error.message + '</div>';
+                            newsContent.innerHTML = '<div class="alert alert-danger">获取新闻失败：' + escapeHtml(error.message) + '</div>';
                         } finally {
                             loading.style.display = 'none';
                         }
@@ -261,4 +435,5 @@ def home():
     '''
 
 if __name__ == '__main__':
+    get_edition_scheduler().start()
     app.run(host='0.0.0.0', port=int(os.environ.get('PORT', 8080)))
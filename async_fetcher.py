@@ -0,0 +1,113 @@
+import asyncio
+import atexit
+import os
+import threading
+import aiohttp
+from rate_limiter import limiter_for_url
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8'
+}
+
+# 页面不存在（HTTP 404/410，如文章已删除或尚未发布）时返回的内容，与下载失败的 None 区分
+MISSING_PAGE = ''
+MISSING_STATUSES = (404, 410)
+
+
+class AsyncFetcher:
+    """基于 aiohttp 的并发页面下载器
+
+    事件循环和 ClientSession 常驻在专用线程中，各批次、各调用方的请求共用同一个连接池，
+    keep-alive 连接跨批次复用；同时限制每个站点的并发连接数。
+    """
+
+    def __init__(self, per_host_limit=None, total_limit=20, timeout=15, headers=None):
+        self.per_host_limit = per_host_limit or int(os.getenv('FETCH_PER_HOST_LIMIT', '4'))
+        self.total_limit = total_limit
+        self.timeout = timeout
+        self.headers = headers or DEFAULT_HEADERS
+        self._lock = threading.Lock()
+        self._loop = None
+        # 只在事件循环线程中访问
+        self._session = None
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='async-fetcher-loop', daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _get_session(self):
+        # ClientSession 必须在其事件循环中创建
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.total_limit,
+                limit_per_host=self.per_host_limit,
+                keepalive_timeout=30
+            )
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            self._session = aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers)
+        return self._session
+
+    async def _fetch(self, session, url):
+        try:
+            await limiter_for_url(url).acquire_async()
+            async with session.get(url) as response:
+                if response.status in MISSING_STATUSES:
+                    return url, MISSING_PAGE
+                if response.status != 200:
+                    print(f"Fetch {url} returned HTTP {response.status}")
+                    return url, None
+                return url, await response.text()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Error fetching {url}: {e}")
+            return url, None
+
+    async def _fetch_all(self, urls):
+        session = self._get_session()
+        results = await asyncio.gather(*(self._fetch(session, url) for url in urls))
+        return dict(results)
+
+    def fetch_all(self, urls):
+        """并发下载所有 URL，返回 {url: html}，失败的 URL 对应 None，不存在的页面对应 MISSING_PAGE
+
+        可在任意线程中调用，请求在常驻的事件循环中执行。
+        """
+        urls = list(urls)
+        if not urls:
+            return {}
+        return asyncio.run_coroutine_threadsafe(self._fetch_all(urls), self._ensure_loop()).result()
+
+    async def _close_session(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def close(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_session(), loop).result(timeout=10)
+        except Exception as e:
+            print(f"Error closing HTTP session: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_async_fetcher = None
+_fetcher_lock = threading.Lock()
+
+
+def get_async_fetcher():
+    """获取进程级共享的下载器，所有抓取共用一个连接池"""
+    global _async_fetcher
+    with _fetcher_lock:
+        if _async_fetcher is None:
+            _async_fetcher = AsyncFetcher()
+            atexit.register(_async_fetcher.close)
+        return _async_fetcher
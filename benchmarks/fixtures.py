@@ -0,0 +1,138 @@
+"""基准测试用的 HTML 页面
+
+默认按固定随机种子生成与线上页面结构一致的迈点网列表页和环球旅讯文章页；
+也可以从目录中读取录制下来的真实页面：
+
+    <dir>/meadin_listing.html
+    <dir>/traveldaily/<文章ID>.html
+"""
+from datetime import datetime, timedelta
+import os
+import random
+
+MEADIN_LISTING_PATH = '/jd/'
+TRAVELDAILY_ARTICLE_PATH = '/article/{}'
+FIRST_ARTICLE_ID = 200000
+
+_SUBJECTS = ['万豪国际', '希尔顿', '洲际酒店集团', '雅高', '凯悦', '锦江酒店', '华住集团', '首旅如家', '亚朵', '开元酒店']
+_CITIES = ['上海', '北京', '三亚', '成都', '杭州', '西安', '厦门', '丽江', '深圳', '重庆', '长沙', '青岛']
+_EVENTS = [
+    '宣布在{city}新开{n}家酒店', '发布第{q}季度财报，RevPAR同比增长{n}%', '在{city}推出全新中端酒店品牌',
+    '与{city}文旅集团签约{n}个度假项目', '上线会员积分新规', '{city}门店入住率回升至{n}%', '在{city}开业首家民宿品牌'
+]
+_OFF_TOPIC = ['{city}航空公司调整{n}条国际航线', '邮轮公司发布{city}夏季航线', '{city}景区门票价格调整', '在线旅游平台发布{city}出行报告']
+# 生成正文用的常用字，随机组合使不同文章的正文互不相似
+_FILLER_CHARS = (
+    '酒店行业市场品牌集团客房住宿度假旅游出行需求增长数据显示今年以来平均房价上涨恢复公司表示未来将继续加大'
+    '城市投入通过数字化提升运营效率分析师指出商务复苏节奏存在明显差异会员渠道直销收益管理中高端连锁加盟'
+    '经济型单体业主投资回报开业签约项目管理输出服务体验产品升级消费者年轻化个性化定制周边游假期预订量'
+)
+# 每隔多少篇文章转载一条列表页上的新闻，用于覆盖去重
+REPRINT_EVERY = 8
+
+
+def _title(rng, off_topic=False):
+    template = rng.choice(_OFF_TOPIC if off_topic else _EVENTS)
+    event = template.format(n=rng.randint(2, 80), q=rng.randint(1, 4), city=rng.choice(_CITIES))
+    return event if off_topic else rng.choice(_SUBJECTS) + event
+
+
+def _paragraphs(rng, title, count):
+    paragraphs = [f"{title}。"]
+    for _ in range(count):
+        sentences = [''.join(rng.choice(_FILLER_CHARS) for _ in range(rng.randint(12, 30))) for _ in range(4)]
+        paragraphs.append('，'.join(sentences) + '。')
+    return paragraphs
+
+
+def meadin_titles(count=40, seed=1):
+    rng = random.Random(seed * 7919)
+    return [_title(rng) for _ in range(count)]
+
+
+def meadin_listing_html(count=40, seed=1, now=None):
+    """迈点网酒店频道列表页，count 条新闻按时间倒序"""
+    rng = random.Random(seed)
+    now = now or datetime.now()
+    boxes = []
+    for i, title in enumerate(meadin_titles(count, seed)):
+        pub_time = now - timedelta(minutes=37 * i + rng.randint(0, 30))
+        boxes.append(
+            f'<div class="news-box clearfix">'
+            f'<div class="pic"><a href="/jd/{300000 - i}.html"><img src="/img/{i}.jpg"></a></div>'
+            f'<div class="info"><h3><a data-cut="newtitle" href="/jd/{300000 - i}.html">{title}</a></h3>'
+            f'<div class="article">{"".join(_paragraphs(rng, title, 1))}</div>'
+            f'<p><span class="lf-news">迈点网</span><span class="rf-news">{pub_time:%Y-%m-%d %H:%M:%S}</span></p>'
+            f'</div></div>'
+        )
+    nav = ''.join(f'<li><a href="/channel/{i}">频道{i}</a></li>' for i in range(60))
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><title>酒店-迈点网</title>'
+        + ''.join(f'<script src="/static/{i}.js"></script>' for i in range(20))
+        + f'</head><body><ul class="nav">{nav}</ul><div class="list">{"".join(boxes)}</div>'
+        + '<div class="footer">' + '友情链接 ' * 200 + '</div></body></html>'
+    )
+
+
+def traveldaily_article_html(article_id, seed=1, now=None, title=None):
+    """环球旅讯文章页；约五分之一的文章与酒店无关"""
+    rng = random.Random(seed * 1000003 + article_id)
+    now = now or datetime.now()
+    title = title or _title(rng, off_topic=rng.random() < 0.2)
+    pub_time = now - timedelta(minutes=41 * (FIRST_ARTICLE_ID + 1000 - article_id))
+    body = ''.join(f'<p>{text}</p>' for text in _paragraphs(rng, title, 12))
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{title}</title></head><body>'
+        f'<div class="header">' + '<a href="/">首页</a>' * 30 + '</div>'
+        f'<h1 class="articleTitle">{title}</h1>'
+        f'<div class="articleTime">{pub_time:%Y-%m-%d %H:%M:%S}</div>'
+        f'<div class="articleContent">{body}</div>'
+        f'<div class="related">' + '<a href="/article/1">相关阅读</a>' * 20 + '</div>'
+        '</body></html>'
+    )
+
+
+def traveldaily_article_ids(count=30):
+    """新到旧排列的文章ID"""
+    newest = FIRST_ARTICLE_ID + 1000
+    return list(range(newest, newest - count, -1))
+
+
+class FixtureSet:
+    """按路径提供页面内容，供本地 HTTP 服务返回"""
+
+    def __init__(self, meadin_count=40, article_count=30, seed=1, recorded_dir=None):
+        self.pages = {}
+        now = datetime.now()
+        self.article_ids = traveldaily_article_ids(article_count)
+        self.pages[MEADIN_LISTING_PATH] = meadin_listing_html(meadin_count, seed, now)
+        titles = meadin_titles(meadin_count, seed)
+        for i, article_id in enumerate(self.article_ids):
+            # 部分文章转载列表页上的新闻（标题改写），用于覆盖跨来源去重
+            reprint = f"独家：{titles[i]}" if i % REPRINT_EVERY == 0 and i < len(titles) else None
+            self.pages[TRAVELDAILY_ARTICLE_PATH.format(article_id)] = traveldaily_article_html(
+                article_id, seed, now, reprint
+            )
+        if recorded_dir:
+            self._load_recorded(recorded_dir)
+
+    def _load_recorded(self, directory):
+        listing = os.path.join(directory, 'meadin_listing.html')
+        if os.path.exists(listing):
+            with open(listing, encoding='utf-8') as f:
+                self.pages[MEADIN_LISTING_PATH] = f.read()
+
+        articles_dir = os.path.join(directory, 'traveldaily')
+        if os.path.isdir(articles_dir):
+            recorded_ids = []
+            for name in os.listdir(articles_dir):
+                article_id, ext = os.path.splitext(name)
+                if ext == '.html' and article_id.isdigit():
+                    with open(os.path.join(articles_dir, name), encoding='utf-8') as f:
+                        self.pages[TRAVELDAILY_ARTICLE_PATH.format(article_id)] = f.read()
+                    recorded_ids.append(int(article_id))
+            if recorded_ids:
+                self.article_ids = sorted(recorded_ids, reverse=True)
+
+    def get(self, path):
+        return self.pages.get(path)
@@ -0,0 +1,70 @@
+"""检查 Vercel 入口 api/index.py 的导入耗时
+
+用 `python -X importtime` 在子进程中导入入口模块，统计总耗时和最重的模块，
+并确认抓取/摘要相关的重模块没有在导入阶段被加载。超出预算或加载了重模块时
+以非零状态退出，可直接放进 CI。
+
+用法: python benchmarks/import_time.py [--budget-ms 300] [--runs 3]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+API_DIR = os.path.join(ROOT, 'api')
+
+# 导入预算（毫秒），取多次运行中的最小值比较
+IMPORT_TIME_BUDGET_MS = float(os.getenv('IMPORT_TIME_BUDGET_MS', '300'))
+# 入口模块导入时不应加载的包
+HEAVY_MODULES = [
+    'selenium', 'webdriver_manager', 'playwright', 'openai', 'bs4', 'lxml',
+    'aiohttp', 'dotenv', 'pytz'
+]
+
+
+def measure_import(module='index', cwd=API_DIR):
+    """导入一次 module，返回 {模块名: 累计耗时(微秒)}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=cwd, capture_output=True, text=True,
+        env={**os.environ, 'ENABLE_EDITION_SCHEDULER': '0'}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        # 格式: "import time:  self [us] | cumulative | imported package"
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+def check(budget_ms=IMPORT_TIME_BUDGET_MS, runs=3, module='index'):
+    best = None
+    for _ in range(runs):
+        timings = measure_import(module)
+        if best is None or timings[module] < best[module]:
+            best = timings
+
+    total_ms = best[module] / 1000
+    top_level = {name: us for name, us in best.items() if '.' not in name and name != module}
+    print(f"import {module}: {total_ms:.1f} ms (budget {budget_ms:.0f} ms, best of {runs})")
+    for name, us in sorted(top_level.items(), key=lambda x: x[1], reverse=True)[:10]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    loaded_heavy = [name for name in HEAVY_MODULES if name in best]
+    if loaded_heavy:
+        print(f"Heavy modules loaded at import time: {', '.join(loaded_heavy)}")
+    return total_ms <= budget_ms and not loaded_heavy
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget-ms', type=float, default=IMPORT_TIME_BUDGET_MS)
+    parser.add_argument('--runs', type=int, default=3)
+    args = parser.parse_args()
+    sys.exit(0 if check(args.budget_ms, args.runs) else 1)
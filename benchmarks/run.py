@@ -0,0 +1,282 @@
+"""离线基准测试
+
+不访问迈点网、环球旅讯和 OpenAI：页面来自 fixtures（生成的或录制的），
+LLM 请求发往本地桩服务。对抓取流程的各阶段分别计时，输出 p50/p95 和峰值内存，
+并与保存的基线比较，任一阶段明显变慢或内存明显增加时以非零状态退出。
+
+阶段：
+    fetch      请求列表页和文章页（http_client / AsyncFetcher）
+    parse      解析列表页和文章页，包括相关度判断
+    select     多来源归并、去重，选出前 N 条
+    summarize  逐条摘要（AISummarizer，每轮使用空缓存）
+    filter     写入新闻库并查询（NewsProcessor.filter_news）
+    digest     整体摘要（NewsSummarizer.summarize_news）
+    format     渲染 markdown/HTML/纯文本/JSON 报告（NewsProcessor.render_report）
+
+用法:
+    python benchmarks/run.py                       # 运行并与 baseline.json 比较
+    python benchmarks/run.py --save-baseline       # 运行并保存为新基线
+    python benchmarks/run.py --llm-latency 200 --iterations 20 --fixtures recorded/
+"""
+from contextlib import contextmanager
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from fixtures import FixtureSet, MEADIN_LISTING_PATH, TRAVELDAILY_ARTICLE_PATH
+from stub_server import StubServer
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+STAGES = ['fetch', 'parse', 'select', 'summarize', 'filter', 'digest', 'format']
+
+# 与基线比较时允许的相对波动，以及计时/内存的绝对容差（太小的阶段只看绝对值）；
+# p95 样本太少、波动大，只展示不参与比较
+DEFAULT_TOLERANCE = 0.25
+TIME_SLACK_MS = 2.0
+MEMORY_SLACK_KB = 256.0
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _configure_environment(server, data_dir):
+    """项目模块在导入时读取配置，必须在导入之前设置"""
+    os.environ.update({
+        'HOTELNEWS_DATA_DIR': data_dir,
+        'OPENAI_API_KEY': 'benchmark',
+        'OPENAI_BASE_URL': server.url + '/v1',
+        'RATE_LIMITS': f"{server.host}=100000:100000,api=100000:100000",
+        'NO_PROXY': '127.0.0.1,localhost',
+        'no_proxy': '127.0.0.1,localhost',
+    })
+
+
+class Pipeline:
+    """用本地服务复现一次完整的抓取、摘要和出报告流程"""
+
+    def __init__(self, server, fixtures, data_dir):
+        from ai_summarizer import AISummarizer
+        from async_fetcher import get_async_fetcher
+        from http_client import HttpClient
+        from meadin_parser import build_news_items, parse_listing
+        from news_processor import NewsProcessor
+        from summarizer import NewsSummarizer
+        from summary_cache import SummaryCache
+        from traveldaily_scraper import TravelDailyScraper
+
+        self.server = server
+        self.fixtures = fixtures
+        self.data_dir = data_dir
+        self.http_client = HttpClient()
+        self.fetcher = get_async_fetcher()
+        self.parse_listing = parse_listing
+        self.build_news_items = build_news_items
+        self.traveldaily = TravelDailyScraper()
+        self.processor = NewsProcessor()
+        self.news_summarizer = NewsSummarizer()
+        self.ai_summarizer = AISummarizer()
+        self.summary_cache_class = SummaryCache
+
+    def run(self, iteration, stage):
+        """执行一轮，stage(name) 为包住每个阶段的上下文管理器"""
+        listing_url = self.server.url + MEADIN_LISTING_PATH
+        article_urls = [self.server.url + TRAVELDAILY_ARTICLE_PATH.format(i) for i in self.fixtures.article_ids]
+
+        with stage('fetch'):
+            listing_html = self.http_client.get(listing_url).text
+            pages = self.fetcher.fetch_all(article_urls)
+
+        with stage('parse'):
+            meadin_items = self.build_news_items(self.parse_listing(listing_html))
+            traveldaily_items = []
+            for url in article_urls:
+                news = self.traveldaily._build_item(url, pages.get(url))
+                if news:
+                    traveldaily_items.append(news)
+            traveldaily_items.sort(key=lambda x: x.ts, reverse=True)
+
+        with stage('select'):
+            top_news = self.processor.select_top_news([iter(meadin_items), iter(traveldaily_items)])
+
+        # 每轮使用空缓存，测量的是实际请求 LLM 的开销
+        self.ai_summarizer.cache = self.summary_cache_class(
+            path=os.path.join(self.data_dir, f'summary_cache_{iteration}.sqlite3')
+        )
+        with stage('summarize'):
+            self.ai_summarizer.summarize_items(top_news)
+
+        with stage('filter'):
+            filtered_news = self.processor.filter_news(top_news)
+
+        with stage('digest'):
+            self.news_summarizer.summarize_news(filtered_news)
+
+        with stage('format'):
+            self.processor.render_report(filtered_news)
+
+
+def run_benchmark(iterations=10, llm_latency=0.05, fetch_latency=0.0, recorded_dir=None, quiet=True):
+    fixtures = FixtureSet(recorded_dir=recorded_dir)
+    data_dir = tempfile.mkdtemp(prefix='hotelnews-bench-')
+    timings = {name: [] for name in STAGES}
+    peaks = {}
+    try:
+        with StubServer(fixtures, llm_latency=llm_latency, fetch_latency=fetch_latency) as server:
+            _configure_environment(server, data_dir)
+            pipeline = Pipeline(server, fixtures, data_dir)
+
+            @contextmanager
+            def timed(name):
+                start = time.perf_counter()
+                yield
+                timings[name].append(time.perf_counter() - start)
+
+            @contextmanager
+            def traced(name):
+                tracemalloc.reset_peak()
+                before = tracemalloc.get_traced_memory()[0]
+                yield
+                peaks[name] = max(peaks.get(name, 0), tracemalloc.get_traced_memory()[1] - before)
+
+            with _silenced(quiet):
+                # 预热一轮（建立连接、导入模块、创建数据库），不计入结果
+                pipeline.run(-1, lambda name: _noop())
+                for i in range(iterations):
+                    pipeline.run(i, timed)
+                # 内存单独测一轮，tracemalloc 会拖慢计时
+                tracemalloc.start()
+                try:
+                    pipeline.run(iterations, traced)
+                finally:
+                    tracemalloc.stop()
+            llm_requests = server.llm_requests
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    return {
+        'config': {
+            'iterations': iterations,
+            'llm_latency_ms': llm_latency * 1000,
+            'fetch_latency_ms': fetch_latency * 1000,
+            'meadin_items': fixtures.get(MEADIN_LISTING_PATH).count('news-box'),
+            'traveldaily_articles': len(fixtures.article_ids),
+            'recorded': bool(recorded_dir),
+            'llm_requests': llm_requests
+        },
+        'stages': {
+            name: {
+                'p50_ms': round(percentile(timings[name], 0.5) * 1000, 3),
+                'p95_ms': round(percentile(timings[name], 0.95) * 1000, 3),
+                'peak_kb': round(peaks.get(name, 0) / 1024, 1)
+            }
+            for name in STAGES
+        }
+    }
+
+
+@contextmanager
+def _noop():
+    yield
+
+
+@contextmanager
+def _silenced(quiet):
+    """被测代码会打印大量日志，默认屏蔽"""
+    if not quiet:
+        yield
+        return
+    stdout = sys.stdout
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        try:
+            yield
+        finally:
+            sys.stdout = stdout
+
+
+def compare(result, baseline, tolerance=DEFAULT_TOLERANCE):
+    """返回相对基线退化的阶段说明列表"""
+    regressions = []
+    for name, current in result['stages'].items():
+        base = baseline.get('stages', {}).get(name)
+        if not base:
+            continue
+        for metric, slack in (('p50_ms', TIME_SLACK_MS), ('peak_kb', MEMORY_SLACK_KB)):
+            limit = base[metric] * (1 + tolerance) + slack
+            if current[metric] > limit:
+                regressions.append(f"{name}.{metric}: {current[metric]:.1f} > {limit:.1f} (baseline {base[metric]:.1f})")
+    return regressions
+
+
+def print_report(result, baseline=None):
+    config = result['config']
+    print(f"{config['iterations']} iterations, LLM latency {config['llm_latency_ms']:.0f} ms, "
+          f"{config['meadin_items']} listing items, {config['traveldaily_articles']} articles, "
+          f"{config['llm_requests']} LLM requests")
+    print(f"{'stage':10s} {'p50 ms':>9s} {'p95 ms':>9s} {'peak KB':>9s}   baseline p50 / peak")
+    for name, stats in result['stages'].items():
+        line = f"{name:10s} {stats['p50_ms']:9.2f} {stats['p95_ms']:9.2f} {stats['peak_kb']:9.1f}"
+        base = (baseline or {}).get('stages', {}).get(name)
+        if base:
+            line += f"   {base['p50_ms']:9.2f} / {base['peak_kb']:.1f}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark for the news pipeline')
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--llm-latency', type=float, default=50, help='stub LLM latency in ms')
+    parser.add_argument('--fetch-latency', type=float, default=0, help='stub page latency in ms')
+    parser.add_argument('--fixtures', help='directory with recorded pages')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--json', help='also write the result to this file')
+    parser.add_argument('--verbose', action='store_true', help='show log output of the pipeline')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.iterations, args.llm_latency / 1000, args.fetch_latency / 1000,
+                           args.fixtures, quiet=not args.verbose)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+            f.write('\n')
+        print_report(result)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    if baseline is None:
+        print("No baseline found, run with --save-baseline to create one")
+        return 0
+    if baseline.get('config', {}).get('llm_latency_ms') != result['config']['llm_latency_ms']:
+        print("Warning: baseline was recorded with a different LLM latency")
+
+    regressions = compare(result, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""本地 HTTP 桩服务：返回固定的 HTML 页面，并模拟 OpenAI 兼容的 Chat Completions 接口
+
+- GET 请求按路径返回 FixtureSet 中的页面
+- POST .../chat/completions 在 llm_latency 秒后返回摘要；批量摘要请求返回对应长度的
+  JSON 数组，stream=true 时以 SSE 分片返回
+"""
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import re
+import threading
+import time
+
+BATCH_COUNT_RE = re.compile(r'以下(\d+)篇新闻')
+STREAM_CHUNK_CHARS = 16
+
+
+def _completion_text(messages):
+    user = messages[-1]['content'] if messages else ''
+    batch = BATCH_COUNT_RE.search(user)
+    if batch:
+        count = int(batch.group(1))
+        return json.dumps([f"第{i}篇新闻的摘要：行业动态，影响中高端酒店市场。" for i in range(1, count + 1)],
+                          ensure_ascii=False)
+    titles = [line[2:] for line in user.splitlines() if line.startswith('- ')]
+    if titles:
+        return '\n'.join(
+            f"{i}. [08:{i:02d}] {title}：该动态反映出行业复苏趋势，对同业定价与扩张节奏有参考意义。"
+            for i, title in enumerate(titles, 1)
+        )
+    return "新闻摘要：酒店行业动态。"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # 响应头和正文分两次写出，不关闭 Nagle 会与延迟 ACK 叠加出约 40ms 的等待
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body, content_type):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        if server.fetch_latency:
+            time.sleep(server.fetch_latency)
+        page = server.fixtures.get(self.path)
+        if page is None:
+            self._send(404, 'not found', 'text/plain')
+        else:
+            self._send(200, page, 'text/html; charset=utf-8')
+
+    def do_POST(self):
+        server = self.server
+        length = int(self.headers.get('Content-Length') or 0)
+        request = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.endswith('/chat/completions'):
+            self._send(404, '{}', 'application/json')
+            return
+
+        with server.lock:
+            server.llm_requests += 1
+        if server.llm_latency:
+            time.sleep(server.llm_latency)
+        text = _completion_text(request.get('messages', []))
+        usage = {'prompt_tokens': length // 3, 'completion_tokens': len(text), 'total_tokens': length // 3 + len(text)}
+        base = {'id': 'chatcmpl-stub', 'created': int(time.time()), 'model': request.get('model', 'stub')}
+
+        if not request.get('stream'):
+            self._send(200, json.dumps({
+                **base, 'object': 'chat.completion', 'usage': usage,
+                'choices': [{'index': 0, 'finish_reason': 'stop',
+                             'message': {'role': 'assistant', 'content': text}}]
+            }, ensure_ascii=False), 'application/json')
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        for start in range(0, len(text), STREAM_CHUNK_CHARS):
+            chunk = {**base, 'object': 'chat.completion.chunk',
+                     'choices': [{'index': 0, 'finish_reason': None,
+                                  'delta': {'content': text[start:start + STREAM_CHUNK_CHARS]}}]}
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+
+class StubServer:
+    """在后台线程中运行的桩服务"""
+
+    def __init__(self, fixtures, llm_latency=0.05, fetch_latency=0.0):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fixtures = fixtures
+        self.httpd.llm_latency = llm_latency
+        self.httpd.fetch_latency = fetch_latency
+        self.httpd.llm_requests = 0
+        self.httpd.lock = threading.Lock()
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name='stub-server', daemon=True)
+
+    @property
+    def host(self):
+        return f"127.0.0.1:{self.httpd.server_address[1]}"
+
+    @property
+    def url(self):
+        return f"http://{self.host}"
+
+    @property
+    def llm_requests(self):
+        return self.httpd.llm_requests
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
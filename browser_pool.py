@@ -0,0 +1,295 @@
+from contextlib import contextmanager
+from functools import lru_cache
+from rate_limiter import limiter_for_url
+import asyncio
+import atexit
+import metrics
+import os
+import threading
+
+try:
+    import psutil
+except ImportError:  # psutil 为可选依赖，缺失时只按页面数回收
+    psutil = None
+
+CHROME_PATH = os.getenv('CHROME_PATH', r"D:\电脑工具\Chrome\App\chrome.exe")
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+
+# 池大小以及浏览器实例的回收条件
+POOL_SIZE = int(os.getenv('BROWSER_POOL_SIZE', '2'))
+MAX_PAGES_PER_BROWSER = int(os.getenv('BROWSER_MAX_PAGES', '50'))
+MAX_BROWSER_MEMORY_MB = int(os.getenv('BROWSER_MAX_MEMORY_MB', '800'))
+
+# Playwright 同时打开的页面数、页面超时（毫秒），以及拦截的资源类型（只需要 HTML）
+PLAYWRIGHT_CONCURRENCY = int(os.getenv('PLAYWRIGHT_CONCURRENCY', '4'))
+PAGE_TIMEOUT_MS = int(os.getenv('PLAYWRIGHT_TIMEOUT_MS', '30000'))
+BLOCKED_RESOURCE_TYPES = ('image', 'media', 'font', 'stylesheet')
+
+
+@lru_cache(maxsize=None)
+def get_driver_path():
+    """解析 ChromeDriver 路径，每个进程只下载/查找一次"""
+    from webdriver_manager.chrome import ChromeDriverManager
+    path = ChromeDriverManager().install()
+    print(f"ChromeDriver resolved at: {path}")
+    return path
+
+
+class _PooledBrowser:
+    def __init__(self, browser, pid=None):
+        self.browser = browser
+        self.pid = pid
+        self.pages = 0
+
+
+class _PageCountingDriver:
+    """借出的 WebDriver 代理，每次 get() 计为打开一个页面，其余属性直接转发"""
+
+    def __init__(self, pooled):
+        self._pooled = pooled
+
+    def get(self, url):
+        self._pooled.pages += 1
+        return self._pooled.browser.get(url)
+
+    def __getattr__(self, name):
+        return getattr(self._pooled.browser, name)
+
+
+class BrowserPool:
+    """进程级 Selenium WebDriver 池
+
+    爬虫通过 driver() 借出一个已启动的浏览器，用完自动归还；
+    浏览器在打开（driver.get）一定数量的页面或内存超过阈值后会被关闭并重建。
+    """
+
+    def __init__(self, size=POOL_SIZE, max_pages=MAX_PAGES_PER_BROWSER, max_memory_mb=MAX_BROWSER_MEMORY_MB):
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _create(self):
+        from selenium import webdriver
+        from selenium.webdriver.chrome.service import Service
+
+        options = webdriver.ChromeOptions()
+        options.add_argument('--headless')  # 无界面模式
+        options.add_argument('--disable-gpu')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument(f'--user-agent={USER_AGENT}')
+        if os.path.exists(CHROME_PATH):
+            options.binary_location = CHROME_PATH
+            print(f"Chrome browser found at: {CHROME_PATH}")
+
+        service = Service(get_driver_path())
+        driver = webdriver.Chrome(service=service, options=options)
+        print("Chrome WebDriver initialized successfully")
+        pid = service.process.pid if service.process else None
+        return _PooledBrowser(driver, pid)
+
+    def _memory_mb(self, pooled):
+        """ChromeDriver 及其所有子进程（浏览器、渲染进程）的常驻内存"""
+        if psutil is None or pooled.pid is None:
+            return 0
+        try:
+            process = psutil.Process(pooled.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except psutil.Error:
+            return 0
+
+    def _should_recycle(self, pooled):
+        if pooled.pages >= self.max_pages:
+            return True
+        return self._memory_mb(pooled) >= self.max_memory_mb
+
+    def _quit(self, pooled):
+        try:
+            pooled.browser.quit()
+            print("Chrome WebDriver closed successfully")
+        except Exception as e:
+            print(f"Error closing Chrome WebDriver: {e}")
+
+    @contextmanager
+    def driver(self):
+        """借出一个 WebDriver，with 块结束后归还到池中"""
+        self._slots.acquire()
+        pooled = None
+        healthy = True
+        try:
+            with self._lock:
+                pooled = self._idle.pop() if self._idle else None
+            if pooled is None:
+                pooled = self._create()
+            yield _PageCountingDriver(pooled)
+        except Exception:
+            # 出错的浏览器状态不可信，直接丢弃
+            healthy = False
+            raise
+        finally:
+            if pooled is not None:
+                if healthy and not self._should_recycle(pooled):
+                    with self._lock:
+                        self._idle.append(pooled)
+                else:
+                    self._quit(pooled)
+            self._slots.release()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for pooled in idle:
+            self._quit(pooled)
+
+
+class PlaywrightPool:
+    """常驻一个 Chromium 的异步 Playwright 浏览器池
+
+    Playwright 对象只能在创建它的事件循环中使用，因此浏览器运行在专用线程的事件循环里，
+    任意线程通过 fetch_all() 提交抓取任务。每个页面使用独立的 context，同一个浏览器中
+    最多同时打开 concurrency 个页面；图片、视频、字体和样式表请求直接拦截，
+    等到指定的选择器出现即返回页面内容。打开一定数量的页面后，在空闲时重启浏览器。
+    """
+
+    def __init__(self, max_pages=MAX_PAGES_PER_BROWSER, concurrency=PLAYWRIGHT_CONCURRENCY,
+                 blocked_types=BLOCKED_RESOURCE_TYPES):
+        self.max_pages = max_pages
+        self.concurrency = concurrency
+        self.blocked_types = frozenset(blocked_types)
+        self._lock = threading.Lock()
+        self._loop = None
+        # 以下属性只在事件循环线程中访问
+        self._playwright = None
+        self._browser = None
+        self._browser_lock = None
+        self._semaphore = None
+        self._pages = 0
+        self._active = 0
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='playwright-loop', daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    async def _acquire_browser(self):
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            # 只在没有页面打开时重启，不打断正在进行的抓取
+            if self._browser is not None and self._pages >= self.max_pages and self._active == 0:
+                await self._close_browser()
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True)
+                self._pages = 0
+            self._active += 1
+            self._pages += 1
+            return self._browser
+
+    async def _close_browser(self):
+        browser, self._browser = self._browser, None
+        if browser is not None:
+            try:
+                await browser.close()
+            except Exception as e:
+                print(f"Error closing Playwright browser: {e}")
+
+    async def _route(self, route):
+        if route.request.resource_type in self.blocked_types:
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _fetch(self, url, wait_selector, timeout, labels):
+        async with self._semaphore:
+            browser = await self._acquire_browser()
+            try:
+                context = await browser.new_context(user_agent=USER_AGENT)
+                try:
+                    await context.route('**/*', self._route)
+                    page = await context.new_page()
+                    await limiter_for_url(url).acquire_async()
+                    # 有选择器时不等待 load 事件，文档开始返回后直接等待选择器
+                    with metrics.span('page_load', fetcher='playwright', **labels):
+                        await page.goto(url, wait_until='commit' if wait_selector else 'domcontentloaded',
+                                        timeout=timeout)
+                    if wait_selector:
+                        with metrics.span('page_wait', fetcher='playwright', **labels):
+                            await page.wait_for_selector(wait_selector, state='attached', timeout=timeout)
+                    return url, await page.content()
+                finally:
+                    await context.close()
+            except Exception as e:
+                print(f"Error fetching {url} with Playwright: {e}")
+                return url, None
+            finally:
+                self._active -= 1
+
+    async def _fetch_all(self, urls, wait_selector, timeout, labels):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._fetch(url, wait_selector, timeout, labels) for url in urls))
+        return dict(results)
+
+    def fetch_all(self, urls, wait_selector=None, timeout=PAGE_TIMEOUT_MS, **labels):
+        """在浏览器中并发打开所有 URL，返回 {url: html}，失败的 URL 对应 None
+
+        wait_selector 为页面就绪的标志（如 '.news-box'）；labels 附加到耗时指标上。
+        """
+        urls = list(urls)
+        if not urls:
+            return {}
+        future = asyncio.run_coroutine_threadsafe(
+            self._fetch_all(urls, wait_selector, timeout, labels), self._ensure_loop()
+        )
+        return future.result()
+
+    async def _shutdown(self):
+        await self._close_browser()
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def close_all(self):
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=30)
+        except Exception as e:
+            print(f"Error closing Playwright: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+
+
+_browser_pool = None
+_playwright_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """获取进程级 Selenium 浏览器池"""
+    global _browser_pool
+    with _pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool()
+            atexit.register(_browser_pool.close_all)
+        return _browser_pool
+
+
+def get_playwright_pool():
+    """获取进程级 Playwright 浏览器池（异步 API，浏览器运行在专用线程中）"""
+    global _playwright_pool
+    with _pool_lock:
+        if _playwright_pool is None:
+            _playwright_pool = PlaywrightPool()
+            atexit.register(_playwright_pool.close_all)
+        return _playwright_pool
@@ -0,0 +1,266 @@
+from storage import data_path
+import hashlib
+import os
+import random
+import re
+import sqlite3
+import struct
+import threading
+import time
+import unicodedata
+
+# 正文开头的估计 Jaccard 相似度不低于该值即视为同一事件（转载时标题常被改写）
+DEDUP_THRESHOLD = float(os.getenv('DEDUP_THRESHOLD', '0.5'))
+# 标题 2-gram 的 Jaccard 相似度不低于该值也视为同一事件。同一公司不同季度的财报、
+# 同一品牌在不同城市开业等标题只差一两个字，相似度在 0.6~0.8 之间，阈值需要更高
+DEDUP_TITLE_THRESHOLD = float(os.getenv('DEDUP_TITLE_THRESHOLD', '0.8'))
+# 标题相近但双方都是完整正文且正文相似度低于该值时，是同题的不同报道，不合并。
+# 列表页摘要与全文开头差别较大，只有一方是完整正文时不做此判断
+DEDUP_CONTENT_CONFLICT = float(os.getenv('DEDUP_CONTENT_CONFLICT', '0.1'))
+# 指纹保留时间（秒），跨次运行识别重复报道
+DEDUP_TTL = int(os.getenv('DEDUP_TTL', str(7 * 24 * 3600)))
+# 参与指纹计算的正文长度
+CONTENT_PREFIX_CHARS = 300
+
+# MinHash 签名长度与 LSH 分段：16 段 × 4 行，相似度约 0.5 以上的两条新闻大概率落入同一个桶
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240101)  # 固定种子，保证跨进程的签名可比
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+_NON_WORD_RE = re.compile(r'[\W_]+')
+
+
+def normalize(text):
+    """全角转半角、转小写，并去掉空白和标点"""
+    return _NON_WORD_RE.sub('', unicodedata.normalize('NFKC', text or '').lower())
+
+
+def _ngrams(text, n):
+    if len(text) <= n:
+        return [text] if text else []
+    return [text[i:i + n] for i in range(len(text) - n + 1)]
+
+
+def _signature(grams):
+    values = [int.from_bytes(hashlib.blake2b(gram.encode('utf-8'), digest_size=8).digest(), 'big') for gram in grams]
+    return [min((a * value + b) % _MERSENNE_PRIME for value in values) for a, b in _PERMUTATIONS]
+
+
+def title_grams(title):
+    """标题归一化后的字符 2-gram 集合"""
+    return set(_ngrams(normalize(title), 2))
+
+
+def jaccard(grams, other):
+    if not grams or not other:
+        return 0.0
+    return len(grams & other) / len(grams | other)
+
+
+def has_full_content(news):
+    """正文是否足够长，可以与另一篇全文比较（列表页上的摘要通常不够长）"""
+    return len(news.content or '') >= CONTENT_PREFIX_CHARS
+
+
+def minhash(news):
+    """计算新闻的 MinHash 签名，返回 {'title': 签名, 'content': 签名}
+
+    标题取字符 2-gram，正文开头取字符 3-gram，分别签名：不同来源转载同一事件时
+    标题常被改写而正文相近，列表页只有标题的新闻也能按标题比较。没有内容的部分不参与比较。
+    """
+    signatures = {}
+    grams = title_grams(news.title)
+    if grams:
+        signatures['title'] = _signature(grams)
+    content_grams = _ngrams(normalize((news.content or '')[:CONTENT_PREFIX_CHARS]), 3)
+    if content_grams:
+        signatures['content'] = _signature(set(content_grams))
+    return signatures
+
+
+def similarity(signature, other):
+    """由两个签名估计 Jaccard 相似度"""
+    return sum(x == y for x, y in zip(signature, other)) / NUM_PERM
+
+
+def _pack(signature):
+    return struct.pack(f'<{NUM_PERM}Q', *signature)
+
+
+def _band_keys(signature):
+    return [struct.pack(f'<{ROWS}Q', *signature[i * ROWS:(i + 1) * ROWS]) for i in range(BANDS)]
+
+
+class DedupIndex:
+    """近期新闻的 MinHash 索引（SQLite），按 LSH 分段建索引做候选查找
+
+    候选新闻再逐条核实，综合标题和正文：正文相近，或标题几乎相同（按原标题计算精确的
+    Jaccard 相似度）且正文没有明显不同，即为同一事件。
+    """
+
+    def __init__(self, path=None, threshold=DEDUP_THRESHOLD, title_threshold=DEDUP_TITLE_THRESHOLD,
+                 conflict_threshold=DEDUP_CONTENT_CONFLICT, ttl=DEDUP_TTL):
+        self.path = path or data_path('dedup.sqlite3')
+        self.threshold = threshold
+        self.title_threshold = title_threshold
+        self.conflict_threshold = conflict_threshold
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS signatures ("
+                "url TEXT NOT NULL, kind TEXT NOT NULL, signature BLOB NOT NULL, canonical TEXT NOT NULL, "
+                "seen_at REAL NOT NULL, PRIMARY KEY (url, kind))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS bands ("
+                "kind TEXT NOT NULL, band INTEGER NOT NULL, bucket BLOB NOT NULL, url TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_bands_bucket ON bands (kind, band, bucket)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_bands_url ON bands (url)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_signatures_seen_at ON signatures (seen_at)")
+            # 旧版本创建的表没有来源、标题和正文完整性列
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(signatures)")}
+            for column, column_type in (('source', 'TEXT'), ('title', 'TEXT'), ('full_content', 'INTEGER')):
+                if column not in columns:
+                    self._conn.execute(f"ALTER TABLE signatures ADD COLUMN {column} {column_type}")
+
+    def canonical_of(self, url):
+        """已收录新闻所在重复簇的代表 URL，未收录时返回 None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT canonical FROM signatures WHERE url = ? AND seen_at >= ? LIMIT 1",
+                (url, time.time() - self.ttl)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _bucket_urls(self, kind, signature, since):
+        """与签名落入同一 LSH 桶的已收录新闻"""
+        conditions = ' OR '.join('(b.band = ? AND b.bucket = ?)' for _ in range(BANDS))
+        params = [value for pair in enumerate(_band_keys(signature)) for value in pair]
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT DISTINCT b.url FROM bands b JOIN signatures s ON s.url = b.url AND s.kind = b.kind "
+                f"WHERE b.kind = ? AND ({conditions}) AND s.seen_at >= ?",
+                [kind] + params + [since]
+            ).fetchall()
+        return {row[0] for row in rows}
+
+    def _is_same_story(self, signatures, grams, full_content, other):
+        other_signatures = other['signatures']
+        content_similarity = None
+        if 'content' in signatures and 'content' in other_signatures:
+            content_similarity = similarity(signatures['content'], other_signatures['content'])
+            if content_similarity >= self.threshold:
+                return True
+
+        if 'title' not in signatures or 'title' not in other_signatures:
+            return False
+        if grams is not None and other['title'] is not None:
+            title_similarity = jaccard(grams, title_grams(other['title']))
+        else:
+            title_similarity = similarity(signatures['title'], other_signatures['title'])
+        if title_similarity < self.title_threshold:
+            return False
+        # 标题几乎相同：两篇全文却几乎没有相同内容时，是同题的不同报道
+        return not (content_similarity is not None and full_content and other['full_content']
+                    and content_similarity < self.conflict_threshold)
+
+    def find_duplicate(self, signatures, url=None, source=None, title=None, full_content=False):
+        """查找与之报道同一事件的已收录新闻（不含 url 本身），返回其重复簇的代表 URL，没有则返回 None
+
+        只与其他来源的新闻比较：同一来源的两条新闻是两篇不同的报道。
+        """
+        since = time.time() - self.ttl
+        candidates = set()
+        for kind, signature in signatures.items():
+            candidates |= self._bucket_urls(kind, signature, since)
+        candidates.discard(url)
+        if not candidates:
+            return None
+
+        placeholders = ', '.join('?' for _ in candidates)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url, kind, signature, canonical, source, title, full_content FROM signatures "
+                f"WHERE url IN ({placeholders}) AND seen_at >= ? ORDER BY seen_at",
+                list(candidates) + [since]
+            ).fetchall()
+        others = {}
+        for other_url, kind, blob, canonical, other_source, other_title, other_full in rows:
+            other = others.setdefault(other_url, {
+                'canonical': canonical, 'source': other_source, 'title': other_title,
+                'full_content': bool(other_full), 'signatures': {}
+            })
+            other['signatures'][kind] = struct.unpack(f'<{NUM_PERM}Q', blob)
+
+        grams = title_grams(title) if title else None
+        for other in others.values():
+            if source is not None and other['source'] == source:
+                continue
+            if self._is_same_story(signatures, grams, full_content, other):
+                return other['canonical']
+        return None
+
+    def add(self, url, signatures, canonical=None, source=None, title=None, full_content=False):
+        """收录新闻的签名，canonical 为其重复簇的代表，默认是它自己"""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM bands WHERE url = ?", (url,))
+            self._conn.execute("DELETE FROM signatures WHERE url = ?", (url,))
+            for kind, signature in signatures.items():
+                self._conn.execute(
+                    "INSERT INTO signatures (url, kind, signature, canonical, seen_at, source, title, full_content) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url, kind, _pack(signature), canonical or url, now, source, title, int(full_content))
+                )
+                self._conn.executemany(
+                    "INSERT INTO bands (kind, band, bucket, url) VALUES (?, ?, ?, ?)",
+                    [(kind, band, bucket, url) for band, bucket in enumerate(_band_keys(signature))]
+                )
+            self._conn.execute(
+                "DELETE FROM bands WHERE url IN (SELECT url FROM signatures WHERE seen_at < ?)", (now - self.ttl,)
+            )
+            self._conn.execute("DELETE FROM signatures WHERE seen_at < ?", (now - self.ttl,))
+
+
+class Deduplicator:
+    """逐条判断新闻是否与其他来源本次或近期已收录的新闻重复
+
+    每个重复簇只保留最先出现的一条作为代表，其余的不再进入摘要和报告。
+    """
+
+    def __init__(self, index=None):
+        self.index = index or get_dedup_index()
+
+    def is_duplicate(self, news):
+        key = news.url or news.title
+        signatures = minhash(news)
+        fields = {'source': news.source, 'title': news.title, 'full_content': has_full_content(news)}
+        # 已收录过的新闻沿用上次的归属，避免重复抓取时代表被换掉
+        canonical = self.index.canonical_of(key) or self.index.find_duplicate(signatures, key, **fields) or key
+        # 重复的新闻也记入索引，与它相似的其他转载同样能归入这个簇
+        self.index.add(key, signatures, canonical, **fields)
+        if canonical != key:
+            print(f"Skipping duplicate story: {news.title[:30]}... (same as {canonical})")
+            return True
+        return False
+
+
+_dedup_index = None
+_index_lock = threading.Lock()
+
+
+def get_dedup_index():
+    """获取进程级共享的指纹索引"""
+    global _dedup_index
+    with _index_lock:
+        if _dedup_index is None:
+            _dedup_index = DedupIndex()
+        return _dedup_index
+
@@ -0,0 +1,130 @@
+from requests.adapters import HTTPAdapter
+from requests.cookies import create_cookie
+from rate_limiter import limiter_for_url
+from storage import data_path
+import json
+import os
+import threading
+import requests
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+    'Connection': 'keep-alive'
+}
+
+
+class HttpClient:
+    """进程级共享的 requests 会话
+
+    - 连接池复用 keep-alive 连接
+    - Cookie 在多次运行之间保存到磁盘
+    - 记录每个 URL 的 ETag/Last-Modified，支持条件请求（304）
+    """
+
+    def __init__(self, cookie_path=None, validator_path=None, timeout=15):
+        self.cookie_path = cookie_path or data_path('cookies.json')
+        self.validator_path = validator_path or data_path('http_validators.json')
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(DEFAULT_HEADERS)
+
+        self._load_cookies()
+        self._validators = self._load_json(self.validator_path)
+
+    @staticmethod
+    def _load_json(path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _save_json(path, data):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _load_cookies(self):
+        data = self._load_json(self.cookie_path)
+        for cookie in data.get('cookies', []) if isinstance(data, dict) else []:
+            self.session.cookies.set_cookie(create_cookie(**cookie))
+
+    def save_cookies(self):
+        cookies = [
+            {
+                'name': cookie.name,
+                'value': cookie.value,
+                'domain': cookie.domain,
+                'path': cookie.path,
+                'expires': cookie.expires,
+                'secure': cookie.secure
+            }
+            for cookie in self.session.cookies
+        ]
+        with self._lock:
+            self._save_json(self.cookie_path, {'cookies': cookies})
+
+    def has_cookies(self, domain):
+        """会话中是否已有该域名的（未过期的）Cookie"""
+        return any(cookie.domain.lstrip('.').endswith(domain) and not cookie.is_expired()
+                   for cookie in self.session.cookies)
+
+    def get(self, url, headers=None, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        limiter_for_url(url).acquire()
+        response = self.session.get(url, headers=headers, **kwargs)
+        self.save_cookies()
+        return response
+
+    def conditional_get(self, url, headers=None, use_validators=True, **kwargs):
+        """带 If-None-Match/If-Modified-Since 的 GET
+
+        调用方需自行保存上一次的解析结果；只有在持有该结果时才应传 use_validators=True，
+        收到 304 时直接复用。
+        """
+        request_headers = dict(headers or {})
+        with self._lock:
+            validators = self._validators.get(url, {}) if use_validators else {}
+        if validators.get('etag'):
+            request_headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            request_headers['If-Modified-Since'] = validators['last_modified']
+
+        response = self.get(url, headers=request_headers, **kwargs)
+        if response.status_code == 304:
+            return response
+        response.raise_for_status()
+
+        new_validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        with self._lock:
+            if any(new_validators.values()):
+                self._validators[url] = new_validators
+            else:
+                self._validators.pop(url, None)
+            self._save_json(self.validator_path, self._validators)
+        return response
+
+
+_http_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """获取进程级共享的 HTTP 客户端"""
+    global _http_client
+    with _client_lock:
+        if _http_client is None:
+            _http_client = HttpClient()
+        return _http_client
@@ -0,0 +1,138 @@
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+import os
+import random
+import threading
+import time
+import openai
+import metrics
+from rate_limiter import limiter_for_api_key
+
+# 同时进行中的 LLM 请求数、单次请求超时（秒）、失败重试次数
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '4'))
+LLM_TIMEOUT = float(os.getenv('LLM_TIMEOUT', '60'))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', '4'))
+
+# 指数退避参数（秒）
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+RETRY_AFTER_MAX = 120.0
+
+
+def _retry_after(error):
+    """从错误响应的 Retry-After / retry-after-ms 头中读取等待秒数"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if not headers:
+        return None
+
+    retry_after_ms = headers.get('retry-after-ms')
+    if retry_after_ms:
+        try:
+            return float(retry_after_ms) / 1000
+        except ValueError:
+            pass
+
+    retry_after = headers.get('retry-after')
+    if not retry_after:
+        return None
+    try:
+        return float(retry_after)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(retry_after)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_retryable(error):
+    if isinstance(error, openai.APIConnectionError):  # 包括 APITimeoutError
+        return True
+    status = getattr(error, 'status_code', None)
+    return status == 429 or (status is not None and status >= 500)
+
+
+class LLMMetrics:
+    """LLM 请求的延迟、token 用量和失败统计，按模型记入 /api/metrics"""
+
+    def record_success(self, latency, usage, model=None):
+        metrics.observe(metrics.LLM_REQUEST_SECONDS, latency, model=model)
+        if usage is not None:
+            metrics.count(metrics.LLM_TOKENS, usage.prompt_tokens or 0, model=model, type='prompt')
+            metrics.count(metrics.LLM_TOKENS, usage.completion_tokens or 0, model=model, type='completion')
+
+    def record_failure(self, retried, model=None):
+        metrics.count(metrics.LLM_FAILURES, model=model, retried='true' if retried else 'false')
+
+
+class LLMExecutor:
+    """带并发上限、重试和指标统计的 LLM 请求执行器
+
+    - 同时进行中的请求数不超过 max_concurrency，退避等待期间不占用名额
+    - 429/5xx/超时/连接错误按指数退避加随机抖动重试，优先遵循 Retry-After
+    - 每次请求都带超时，并按 API Key 共享限速器
+    """
+
+    def __init__(self, max_concurrency=LLM_MAX_CONCURRENCY, timeout=LLM_TIMEOUT, max_retries=LLM_MAX_RETRIES):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.metrics = LLMMetrics()
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def _backoff(self, error, attempt):
+        retry_after = _retry_after(error)
+        if retry_after is not None:
+            return min(retry_after, RETRY_AFTER_MAX)
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def chat(self, client, **kwargs):
+        """调用 client.chat.completions.create，失败时按策略重试，最终失败则抛出最后一个异常"""
+        kwargs.setdefault('timeout', self.timeout)
+        limiter = limiter_for_api_key(client.api_key)
+        for attempt in range(self.max_retries + 1):
+            limiter.acquire()
+            with self._slots:
+                start = time.perf_counter()
+                try:
+                    response = client.chat.completions.create(**kwargs)
+                except Exception as e:
+                    error = e
+                else:
+                    self.metrics.record_success(time.perf_counter() - start, getattr(response, 'usage', None),
+                                                kwargs.get('model'))
+                    return response
+
+            retry = attempt < self.max_retries and _is_retryable(error)
+            self.metrics.record_failure(retried=retry, model=kwargs.get('model'))
+            if not retry:
+                raise error
+            delay = self._backoff(error, attempt)
+            print(f"LLM request failed ({error}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+    def map(self, fn, iterable):
+        """并发执行 fn(item)（fn 内部通常调用 chat），按输入顺序返回结果"""
+        items = list(iterable)
+        if len(items) <= 1:
+            return [fn(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(len(items), self.max_concurrency),
+                                thread_name_prefix='llm') as pool:
+            return list(pool.map(fn, items))
+
+
+_llm_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_llm_executor():
+    """获取进程级共享的 LLM 执行器"""
+    global _llm_executor
+    with _executor_lock:
+        if _llm_executor is None:
+            _llm_executor = LLMExecutor()
+        return _llm_executor
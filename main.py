@@ -2,9 +2,11 @@ from scraper import MeadinScraper
 from traveldaily_scraper import TravelDailyScraper
 from news_processor import NewsProcessor
 from summarizer import NewsSummarizer
+from aggregator import collect_top_news
 from datetime import datetime
 import pytz
 import os
+import sys
 from dotenv import load_dotenv
 
 # 确保在程序开始时就加载环境变量
@@ -12,9 +14,10 @@ load_dotenv()
 
 class NewsAggregator:
     def __init__(self):
-        self.scrapers = [
-            MeadinScraper(),
-            TravelDailyScraper()
+        # 注册的新闻源，抓取时在各自线程中实例化并同时运行
+        self.sources = [
+            MeadinScraper,
+            TravelDailyScraper
         ]
         self.processor = NewsProcessor()
         try:
@@ -24,16 +27,13 @@ class NewsAggregator:
             print(f"Error initializing AI summarizer: {e}")
             self.use_ai = False
 
+    def fetch_top_news(self, is_morning=True):
+        """流式归并各来源，只抓取并摘要进入前10的新闻"""
+        return collect_top_news(self.sources, self.processor, is_morning)
+
     def get_news_summary(self, is_morning=True):
-        # 从多个来源获取新闻
-        news_items = []
-        for scraper in self.scrapers:
-            try:
-                items = scraper.get_news()
-                if items:
-                    news_items.extend(items)
-            except Exception as e:
-                print(f"Error getting news from {scraper.__class__.__name__}: {e}")
+        # 从多个来源获取最新的新闻
+        news_items = self.fetch_top_news(is_morning)
         
         # 过滤新闻
         filtered_news = self.processor.filter_news(news_items, is_morning)
@@ -44,7 +44,7 @@ class NewsAggregator:
         # 如果启用了AI摘要，使用AI生成摘要
         if self.use_ai:
             try:
-                return self.summarizer.summarize_news(filtered_news)
+                return self.summarizer.summarize_news(filtered_news, is_morning)
             except Exception as e:
                 print(f"AI summarization failed: {e}")
                 # 如果AI摘要失败，使用常规格式化
@@ -53,29 +53,23 @@ class NewsAggregator:
             # 使用常规格式化
             return self.processor.format_news_report(filtered_news, is_morning)
 
+    def stream_news_summary(self, is_morning=True):
+        """get_news_summary 的流式版本，AI 摘要逐段产出"""
+        news_items = self.fetch_top_news(is_morning)
+        filtered_news = self.processor.filter_news(news_items, is_morning)
+        
+        if not filtered_news:
+            yield "暂无相关新闻"
+        elif self.use_ai:
+            yield from self.summarizer.summarize_news_stream(filtered_news, is_morning)
+        else:
+            yield self.processor.format_news_report(filtered_news, is_morning)
+
 def handle_command():
     aggregator = NewsAggregator()
     
-    # 获取所有新闻
-    news_items = []
-    
-    # 从迈点网获取新闻
-    try:
-        meadin_scraper = MeadinScraper()
-        meadin_news = meadin_scraper.get_news()
-        if meadin_news:
-            news_items.extend(meadin_news)
-    except Exception as e:
-        print(f"Error getting news from Meadin: {e}")
-    
-    # 从环球旅讯获取新闻
-    try:
-        traveldaily_scraper = TravelDailyScraper()
-        traveldaily_news = traveldaily_scraper.get_news()
-        if traveldaily_news:
-            news_items.extend(traveldaily_news)
-    except Exception as e:
-        print(f"Error getting news from TravelDaily: {e}")
+    # 并发获取所有来源（迈点网、环球旅讯）最新的新闻
+    news_items = aggregator.fetch_top_news()
     
     # 过滤和格式化新闻
     processor = NewsProcessor()
@@ -83,4 +77,10 @@ def handle_command():
     return processor.format_news_report(filtered_news)
 
 if __name__ == "__main__":
-    print(handle_command())
+    if '--stream' in sys.argv:
+        # 流式输出 AI 摘要，边生成边打印
+        for chunk in NewsAggregator().stream_news_summary():
+            print(chunk, end='', flush=True)
+        print()
+    else:
+        print(handle_command())
@@ -0,0 +1,112 @@
+from ai_summarizer import summarize_items
+from http_client import get_http_client
+from meadin_parser import build_news_items, parse_listing
+from news_item import NewsItem
+from storage import data_path
+from tiered_fetcher import TieredFetcher
+import json
+import metrics
+
+# 列表页就绪的标志：新闻容器的 CSS 类名
+LISTING_MARKER = 'news-box'
+
+class MeadinScraper:
+    """迈点网抓取器：先直接请求列表页，缺少新闻容器时才用无头浏览器渲染
+
+    列表页目前是服务端渲染的，通常一次 HTTP 请求即可，不必启动浏览器；
+    是否需要浏览器由 TieredFetcher 按 URL 模式记录。页面未变化（304）时复用上一次的结果。
+    """
+
+    # 浏览器后备的实现（selenium / playwright），None 时使用 FETCH_BROWSER_BACKEND
+    browser_backend = None
+
+    def __init__(self):
+        self.base_url = "https://www.meadin.com/jd/"
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36',
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+            'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+            'Referer': 'https://www.meadin.com/'
+        }
+        self.listing_path = data_path('meadin_http_listing.json')
+        self.fetcher = TieredFetcher(browser_backend=self.browser_backend)
+
+    def get_news(self):
+        news_items = self._fetch_listing()
+
+        # 使用AI批量生成摘要
+        summarize_items(news_items)
+
+        print(f"Successfully collected {len(news_items)} news items")
+        return news_items
+
+    def iter_news(self):
+        """按发布时间从新到旧逐条产出新闻，不生成摘要（正文保存在 content 中）"""
+        yield from self._fetch_listing()
+
+    def _fetch_listing(self):
+        """获取并解析列表页，返回按发布时间倒序排列的新闻"""
+        try:
+            if self.fetcher.use_http(self.base_url):
+                previous_items = self._load_previous()
+                response = self._get_listing(use_validators=previous_items is not None)
+                if response.status_code == 304:
+                    print("Meadin listing not modified, reusing previous items")
+                    return previous_items
+                response.raise_for_status()
+                html = response.text
+                if self.fetcher.needs_browser(self.base_url, html, LISTING_MARKER):
+                    print("Meadin listing has no news containers, rendering it in a browser")
+                    html = self._get_listing_with_browser()
+            else:
+                html = self._get_listing_with_browser()
+            if not html:
+                print("Warning: Meadin listing could not be loaded")
+                return []
+
+            with metrics.span('parse', source='MeadinScraper'):
+                entries = parse_listing(html)
+                news_items = build_news_items(entries)
+            print(f"Found {len(entries)} news containers")
+            if news_items:
+                self._save_previous(news_items)
+            else:
+                print("Warning: No news items found")
+                print("Response content preview:", html[:500])
+            return news_items
+
+        except Exception as e:
+            print(f"Error scraping news: {e}")
+            return []
+
+        finally:
+            self.fetcher.flush()
+
+    def _get_listing(self, use_validators):
+        client = get_http_client()
+
+        # 没有保存的 cookies 时才访问主页获取
+        if not client.has_cookies('meadin.com'):
+            client.get('https://www.meadin.com/', headers=self.headers)
+
+        metrics.count(metrics.FETCH_TIER, tier='http', source='MeadinScraper')
+        with metrics.span('page_load', source='MeadinScraper', fetcher='http'):
+            return client.conditional_get(self.base_url, headers=self.headers, use_validators=use_validators)
+
+    def _get_listing_with_browser(self):
+        pages = self.fetcher.fetch_browser([self.base_url], LISTING_MARKER, source='MeadinScraper')
+        return pages.get(self.base_url)
+
+    def _load_previous(self):
+        """读取上一次的解析结果，不存在时返回 None"""
+        try:
+            with open(self.listing_path, encoding='utf-8') as f:
+                items = json.load(f)
+            return [NewsItem.from_dict(item) for item in items]
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def _save_previous(self, news_items):
+        items = [news.to_dict() for news in news_items]
+        with open(self.listing_path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, ensure_ascii=False)
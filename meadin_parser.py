@@ -0,0 +1,157 @@
+from bs4 import BeautifulSoup, SoupStrainer
+import os
+import sys
+import time
+import tracemalloc
+
+from news_item import NewsItem, parse_china_time
+
+try:
+    import lxml.html
+except ImportError:  # 未安装 lxml 时使用 SoupStrainer 后端
+    lxml = None
+
+# 可通过环境变量强制指定解析后端：lxml / strainer / soup
+PARSER_BACKEND = os.getenv('MEADIN_PARSER_BACKEND')
+
+SITE_URL = "https://www.meadin.com"
+
+
+def _class_xpath(tag, class_name, axis='.//'):
+    return f"{axis}{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+def _parse_lxml(html):
+    """lxml + XPath，只读取需要的几个节点"""
+    try:
+        root = lxml.html.fromstring(html)
+    except ValueError:
+        # 带 XML 编码声明的字符串需要以字节形式解析
+        root = lxml.html.fromstring(html.encode('utf-8'))
+    entries = []
+    # 页面片段的根节点本身可能就是 news-box
+    for container in root.xpath(_class_xpath('div', 'news-box', 'descendant-or-self::')):
+        title_elems = container.xpath(".//a[@data-cut='newtitle']")
+        time_elems = container.xpath(_class_xpath('span', 'rf-news'))
+        content_elems = container.xpath(_class_xpath('div', 'article'))
+        entries.append({
+            'title': title_elems[0].text_content().strip() if title_elems else None,
+            'time_str': time_elems[0].text_content().strip() if time_elems else None,
+            'href': title_elems[0].get('href') if title_elems else None,
+            'content': content_elems[0].text_content().strip() if content_elems else ""
+        })
+    return entries
+
+
+def _parse_containers(containers):
+    entries = []
+    for container in containers:
+        title_elem = container.find('a', attrs={'data-cut': 'newtitle'})
+        time_elem = container.find('span', class_='rf-news')
+        content_elem = container.find('div', class_='article')
+        entries.append({
+            'title': title_elem.text.strip() if title_elem else None,
+            'time_str': time_elem.text.strip() if time_elem else None,
+            'href': title_elem.get('href') if title_elem else None,
+            'content': content_elem.text.strip() if content_elem else ""
+        })
+    return entries
+
+
+def _has_news_box_class(value):
+    # 解析阶段 class 可能还是未拆分的字符串，如 "news-box clearfix"
+    if not value:
+        return False
+    classes = value.split() if isinstance(value, str) else value
+    return 'news-box' in classes
+
+
+def _parse_strainer(html):
+    """BeautifulSoup + SoupStrainer，只为 news-box 子树建树"""
+    soup = BeautifulSoup(html, 'html.parser', parse_only=SoupStrainer('div', class_=_has_news_box_class))
+    return _parse_containers(soup.find_all('div', class_='news-box'))
+
+
+def _parse_soup(html):
+    """原始实现：完整解析整个页面"""
+    soup = BeautifulSoup(html, 'html.parser')
+    return _parse_containers(soup.find_all('div', class_='news-box'))
+
+
+BACKENDS = {
+    'lxml': _parse_lxml,
+    'strainer': _parse_strainer,
+    'soup': _parse_soup
+}
+
+
+def default_backend():
+    if PARSER_BACKEND in BACKENDS:
+        return PARSER_BACKEND
+    return 'lxml' if lxml is not None else 'strainer'
+
+
+def parse_listing(html, backend=None):
+    """解析迈点网列表页
+
+    返回每个 news-box 的原始字段 {'title', 'time_str', 'href', 'content'}，
+    缺失的标题/时间/链接为 None，由调用方决定如何处理。
+    """
+    return BACKENDS[backend or default_backend()](html)
+
+
+def build_news_items(entries):
+    """把 parse_listing 的结果转换为 NewsItem，按发布时间倒序排列
+
+    缺少标题或时间、时间无法解析的条目会被跳过。
+    """
+    news_items = []
+    for entry in entries:
+        if not entry['title'] or not entry['time_str']:
+            continue
+        time_str = entry['time_str']
+        try:
+            ts = parse_china_time(time_str)
+        except ValueError as e:
+            print(f"Error parsing time: {time_str} - {str(e)}")
+            continue
+        
+        url = entry['href'] or ''
+        if url and not url.startswith('http'):
+            url = f"{SITE_URL}{url}"
+        
+        news_items.append(NewsItem(entry['title'], ts, url=url, content=entry['content']))
+    
+    news_items.sort(key=lambda x: x.ts, reverse=True)
+    return news_items
+
+
+def compare_backends(html, repeat=5):
+    """检查各后端结果是否一致，并测量解析耗时与峰值内存"""
+    available = [name for name in BACKENDS if name != 'lxml' or lxml is not None]
+    reference = _parse_soup(html)
+    results = {}
+    for name in available:
+        tracemalloc.start()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            entries = BACKENDS[name](html)
+        elapsed = (time.perf_counter() - start) / repeat
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = {
+            'seconds': elapsed,
+            'peak_kb': peak / 1024,
+            'entries': len(entries),
+            'matches_reference': entries == reference
+        }
+    return results
+
+
+if __name__ == '__main__':
+    # 用法: python meadin_parser.py saved_listing.html
+    with open(sys.argv[1], encoding='utf-8') as f:
+        page = f.read()
+    for name, result in compare_backends(page).items():
+        print(f"{name:10s} {result['seconds'] * 1000:8.2f} ms  peak {result['peak_kb']:9.1f} KB  "
+              f"entries {result['entries']:3d}  parity {'OK' if result['matches_reference'] else 'MISMATCH'}")
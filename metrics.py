@@ -0,0 +1,163 @@
+from collections import deque
+from contextlib import contextmanager
+import threading
+import time
+
+# 计算分位数时每组标签保留的最近观测值数量
+SUMMARY_WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+# 指标名称
+STAGE_SECONDS = 'hotelnews_stage_seconds'
+STAGE_FAILURES = 'hotelnews_stage_failures_total'
+SOURCE_ITEMS = 'hotelnews_source_items_total'
+LLM_REQUEST_SECONDS = 'hotelnews_llm_request_seconds'
+LLM_TOKENS = 'hotelnews_llm_tokens_total'
+LLM_FAILURES = 'hotelnews_llm_failures_total'
+CACHE_REQUESTS = 'hotelnews_cache_requests_total'
+FETCH_TIER = 'hotelnews_fetch_tier_total'
+
+HELP = {
+    STAGE_SECONDS: 'Duration of pipeline stages in seconds',
+    STAGE_FAILURES: 'Pipeline stages that raised an error',
+    SOURCE_ITEMS: 'News items collected per source',
+    LLM_REQUEST_SECONDS: 'Latency of successful LLM requests in seconds',
+    LLM_TOKENS: 'LLM tokens used',
+    LLM_FAILURES: 'Failed LLM request attempts',
+    CACHE_REQUESTS: 'Cache lookups by cache and result',
+    FETCH_TIER: 'Page fetches by tier (http or browser backend)',
+}
+
+
+def _label_key(labels):
+    return tuple(sorted((key, str(value)) for key, value in labels.items() if value is not None))
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _quantile(ordered, fraction):
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+
+class Summary:
+    """按标签分组的观测值：累计 count/sum，分位数取最近 SUMMARY_WINDOW 个值"""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'count': 0, 'sum': 0.0, 'window': deque(maxlen=SUMMARY_WINDOW)}
+            series['count'] += 1
+            series['sum'] += value
+            series['window'].append(value)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} summary"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                ordered = sorted(series['window'])
+                for fraction in QUANTILES:
+                    labels = _format_labels(key, [('quantile', str(fraction))])
+                    lines.append(f"{self.name}{labels} {_quantile(ordered, fraction):.6f}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {series['sum']:.6f}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """进程内的指标集合，以 Prometheus 文本格式导出"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, HELP.get(name, name))
+            return metric
+
+    def counter(self, name):
+        return self._get(Counter, name)
+
+    def summary(self, name):
+        return self._get(Summary, name)
+
+    def render(self):
+        with self._lock:
+            metrics = [self._metrics[name] for name in sorted(self._metrics)]
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+_registry = MetricsRegistry()
+
+
+def get_registry():
+    """获取进程级共享的指标集合"""
+    return _registry
+
+
+def count(name, amount=1, **labels):
+    _registry.counter(name).inc(amount, **labels)
+
+
+def observe(name, value, **labels):
+    _registry.summary(name).observe(value, **labels)
+
+
+@contextmanager
+def span(stage, **labels):
+    """记录一个阶段的耗时；阶段内抛出异常时同时计一次失败"""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        count(STAGE_FAILURES, stage=stage, **labels)
+        raise
+    finally:
+        observe(STAGE_SECONDS, time.perf_counter() - start, stage=stage, **labels)
+
+
+def render():
+    """以 Prometheus 文本格式导出所有指标"""
+    return _registry.render()
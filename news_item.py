@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta, timezone
+import calendar
+import hashlib
+import time
+
+# 北京时间没有夏令时，使用固定偏移的时区对象，避免每条新闻都查询 pytz 时区
+CHINA_UTC_OFFSET = 8 * 3600
+CHINA_TZ = timezone(timedelta(seconds=CHINA_UTC_OFFSET), 'Asia/Shanghai')
+
+
+def parse_china_time(time_str):
+    """把北京时间 "YYYY-MM-DD HH:MM:SS"（或 "YYYY-MM-DD HH:MM"、"YYYY-MM-DD"）解析为 UTC 时间戳
+
+    按固定位置切片取数字，比 strptime + localize 快一个数量级；格式不符时抛出 ValueError。
+    """
+    text = time_str.strip()
+    length = len(text)
+    if length not in (10, 16, 19) or text[4] != '-' or text[7] != '-':
+        raise ValueError(f"Unsupported time format: {time_str!r}")
+    if length > 10 and (text[10] not in ' T' or text[13] != ':' or (length == 19 and text[16] != ':')):
+        raise ValueError(f"Unsupported time format: {time_str!r}")
+
+    year, month, day = int(text[0:4]), int(text[5:7]), int(text[8:10])
+    hour = int(text[11:13]) if length > 10 else 0
+    minute = int(text[14:16]) if length > 10 else 0
+    second = int(text[17:19]) if length == 19 else 0
+    if not (1 <= month <= 12 and 1 <= day <= calendar.monthrange(year, month)[1]
+            and hour < 24 and minute < 60 and second < 60):
+        raise ValueError(f"Invalid time: {time_str!r}")
+    return calendar.timegm((year, month, day, hour, minute, second)) - CHINA_UTC_OFFSET
+
+
+def to_china_time(ts):
+    """UTC 时间戳转为带北京时区的 datetime"""
+    return datetime.fromtimestamp(ts, CHINA_TZ)
+
+
+def url_hash(key):
+    """URL（没有链接时为标题）的 64 位哈希"""
+    return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class NewsItem:
+    """在抓取、去重、摘要、入库和出报告之间传递的一条新闻
+
+    发布时间在抓取时一次性转换为整数时间戳 ts，比较和排序都直接用整数；
+    需要展示时再通过 pub_time 转换。summary/source/content 在流程中逐步填充，因此不是只读的。
+    """
+
+    __slots__ = ('title', 'ts', 'url', 'url_hash', 'source', 'summary', 'content')
+
+    def __init__(self, title, ts, url=None, source=None, summary=None, content=None):
+        self.title = title
+        self.ts = int(ts)
+        self.url = url or None
+        self.url_hash = url_hash(url or title)
+        self.source = source
+        self.summary = summary
+        # 正文只在生成摘要前临时保存
+        self.content = content
+
+    @classmethod
+    def from_time_str(cls, title, time_str, **fields):
+        """由页面上的北京时间字符串创建；时间为空时取当前时间"""
+        ts = parse_china_time(time_str) if time_str else time.time()
+        return cls(title, ts, **fields)
+
+    @property
+    def pub_time(self):
+        return to_china_time(self.ts)
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != 'url_hash'}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['title'], data['ts'], url=data.get('url'), source=data.get('source'),
+                   summary=data.get('summary'), content=data.get('content'))
+
+    def __eq__(self, other):
+        if not isinstance(other, NewsItem):
+            return NotImplemented
+        return self.url_hash == other.url_hash and self.ts == other.ts and self.title == other.title
+
+    def __hash__(self):
+        return hash(self.url_hash)
+
+    def __repr__(self):
+        return f"NewsItem({self.title[:20]!r}, {self.pub_time:%Y-%m-%d %H:%M}, source={self.source!r})"
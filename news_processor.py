@@ -1,48 +1,63 @@
 from datetime import datetime, timedelta
+from dedup import Deduplicator
+from news_store import get_news_store
+from report_renderer import Report, render
+import heapq
+import metrics
 import pytz
 
+# 每期报告的新闻条数
+TOP_N = 10
+
 class NewsProcessor:
     @staticmethod
-    def filter_news(news_items, is_morning=True):
+    def _window_start():
         now = datetime.now(pytz.timezone('Asia/Shanghai'))
         
         # 获取最近三天的新闻
         today = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        three_days_ago = today - timedelta(days=3)
-        
-        filtered_news = []
-        for news in news_items:
-            # 检查是否是最近三天的新闻
-            news_date = news['pub_time'].replace(hour=0, minute=0, second=0, microsecond=0)
-            if news_date >= three_days_ago:
-                filtered_news.append(news)
-                    
-        # 按时间倒序排序并取前10条
-        filtered_news.sort(key=lambda x: x['pub_time'], reverse=True)
-        return filtered_news[:10]
+        return today - timedelta(days=3)
 
     @staticmethod
-    def format_news_report(news_items, is_morning=True):
-        """格式化新闻报告为markdown格式"""
-        if not news_items:
-            return "暂无相关新闻"
+    def filter_news(news_items, is_morning=True):
+        # 新抓取的新闻写入本地新闻库，再按时间倒序查询最近三天的前10条
+        with metrics.span('filter_news'):
+            store = get_news_store()
+            store.upsert(news_items)
+            return store.query(since=NewsProcessor._window_start(), limit=TOP_N)
 
-        # 获取当前时间
-        current_time = datetime.now(pytz.timezone('Asia/Shanghai'))
-        time_str = current_time.strftime("%Y年%m月%d日")
-        
-        # 构建报告
-        report = f"# {time_str}酒店新闻速报\n\n"
-        
-        # 添加每条新闻
-        for i, news in enumerate(news_items, 1):
-            report += f"{i}. {news['title']}\n"
-            if 'summary' in news:
-                report += f"{news['summary']}\n"
-            report += f"[原文链接]({news['url']})\n\n"
+    @staticmethod
+    def select_top_news(streams, is_morning=True, limit=TOP_N):
+        """对各来源按时间倒序产出的新闻做 k 路归并，取时间窗口内最新的 limit 条
+
+        取满 limit 条或遇到早于窗口起点的新闻即停止拉取，后面的新闻都更旧。
+        不同来源（或近几天已收录）的同一事件只保留最先出现的一条，不占名额。
+        """
+        since = int(NewsProcessor._window_start().timestamp())
+        merged = heapq.merge(*streams, key=lambda x: x.ts, reverse=True)
+        deduplicator = Deduplicator()
         
-        # 添加分隔线和页脚
-        report += "------\n\n"
-        report += "【酒店英语】早报，更多资讯请访问：https://www.hotelenglish.cn/"
+        top_news = []
+        for news in merged:
+            if news.ts < since:
+                break
+            if deduplicator.is_duplicate(news):
+                continue
+            top_news.append(news)
+            if len(top_news) >= limit:
+                break
         
-        return report
+        # 各来源只是大致有序，最终结果再排一次
+        top_news.sort(key=lambda x: x.ts, reverse=True)
+        return top_news
+
+    @staticmethod
+    def format_news_report(news_items, is_morning=None):
+        """格式化新闻报告为markdown格式"""
+        return NewsProcessor.render_report(news_items, is_morning)['markdown']
+
+    @staticmethod
+    def render_report(news_items, is_morning=None):
+        """逐条列出新闻的报告，返回 markdown/html/text/json 各格式的渲染结果"""
+        with metrics.span('format_news_report'):
+            return render(Report(news_items, is_morning=is_morning))
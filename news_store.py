@@ -0,0 +1,95 @@
+from news_item import CHINA_UTC_OFFSET, NewsItem
+from storage import data_path
+import hashlib
+import sqlite3
+import threading
+
+
+def _news_key(news):
+    """新闻的唯一键：优先使用 URL，没有链接的新闻使用标题哈希"""
+    if news.url:
+        return news.url
+    return 'title:' + hashlib.sha1(news.title.encode('utf-8')).hexdigest()
+
+
+class NewsStore:
+    """基于 SQLite 的本地新闻库
+
+    以 URL 为唯一键写入（重复抓取时更新），pub_time 以整数时间戳存储并建立索引，
+    过滤新闻变为索引上的范围查询。
+    """
+
+    def __init__(self, path=None):
+        self.path = path or data_path('news.sqlite3')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS news ("
+                "key TEXT PRIMARY KEY, url TEXT, title TEXT NOT NULL, summary TEXT, "
+                "source TEXT, pub_time INTEGER NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_news_pub_time ON news (pub_time)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_news_source_pub_time ON news (source, pub_time)")
+
+    def upsert(self, news_items):
+        """写入新闻，已存在的 URL 更新标题和时间，新的摘要/来源为空时保留原值"""
+        rows = [
+            (_news_key(news), news.url, news.title, news.summary, news.source, news.ts)
+            for news in news_items
+        ]
+        if not rows:
+            return
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO news (key, url, title, summary, source, pub_time) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                "title = excluded.title, pub_time = excluded.pub_time, "
+                "summary = COALESCE(excluded.summary, news.summary), "
+                "source = COALESCE(excluded.source, news.source)",
+                rows
+            )
+
+    def query(self, since, until=None, limit=10, hours=None, source=None):
+        """按发布时间倒序查询
+
+        since/until 为带时区的 datetime；hours 为 (起始小时, 结束小时)，按北京时间筛选
+        发布时刻所在的小时，例如 (0, 12) 表示上午。
+        """
+        conditions = ["pub_time >= ?"]
+        params = [int(since.timestamp())]
+        if until is not None:
+            conditions.append("pub_time < ?")
+            params.append(int(until.timestamp()))
+        if source is not None:
+            conditions.append("source = ?")
+            params.append(source)
+        if hours is not None:
+            conditions.append("((pub_time + ?) % 86400) / 3600 BETWEEN ? AND ?")
+            params.extend([CHINA_UTC_OFFSET, hours[0], hours[1] - 1])
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT url, title, summary, source, pub_time FROM news "
+                f"WHERE {' AND '.join(conditions)} ORDER BY pub_time DESC LIMIT ?",
+                params
+            ).fetchall()
+
+        return [
+            NewsItem(title, pub_time, url=url, source=source, summary=summary)
+            for url, title, summary, source, pub_time in rows
+        ]
+
+
+_news_store = None
+_store_lock = threading.Lock()
+
+
+def get_news_store():
+    """获取进程级共享的新闻库"""
+    global _news_store
+    with _store_lock:
+        if _news_store is None:
+            _news_store = NewsStore()
+        return _news_store
@@ -0,0 +1,85 @@
+from urllib.parse import urlsplit
+import asyncio
+import hashlib
+import os
+import threading
+import time
+
+# 默认速率：每秒令牌数, 桶容量（突发数量）
+DEFAULT_HOST_RATE = (2.0, 2)
+DEFAULT_API_RATE = (3.0, 3)
+
+
+def _parse_rate_limits(spec):
+    """解析 RATE_LIMITS，格式如 "www.meadin.com=0.5:2,www.traveldaily.cn=5:5,api=3:3" """
+    limits = {}
+    for part in filter(None, (item.strip() for item in spec.split(','))):
+        try:
+            key, value = part.split('=', 1)
+            rate, _, capacity = value.partition(':')
+            limits[key.strip()] = (float(rate), int(capacity or 1))
+        except ValueError:
+            print(f"Ignoring invalid rate limit setting: {part}")
+    return limits
+
+
+RATE_LIMITS = _parse_rate_limits(os.getenv('RATE_LIMITS', ''))
+
+
+class TokenBucket:
+    """令牌桶限速器
+
+    令牌以 rate 个/秒的速度补充，最多累积 capacity 个。acquire 会预约一个令牌，
+    令牌不足时只等待到预约的令牌产生为止，并发的调用方按到达顺序排队。
+    """
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        """预约一个令牌，返回需要等待的秒数"""
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            self.tokens -= 1
+            return max(0.0, -self.tokens / self.rate)
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_limiter(key, default_rate=DEFAULT_HOST_RATE):
+    """按 key 获取进程级共享的令牌桶，速率取自 RATE_LIMITS 配置"""
+    with _buckets_lock:
+        bucket = _buckets.get(key)
+        if bucket is None:
+            rate, capacity = RATE_LIMITS.get(key, default_rate)
+            bucket = _buckets[key] = TokenBucket(rate, capacity)
+        return bucket
+
+
+def limiter_for_url(url):
+    """按站点（host）限速"""
+    return get_limiter(urlsplit(url).netloc, DEFAULT_HOST_RATE)
+
+
+def limiter_for_api_key(api_key):
+    """按 API Key 限速，同一个 Key 的所有调用共享额度；RATE_LIMITS 中的 "api" 项为其配置"""
+    digest = hashlib.sha1((api_key or '').encode('utf-8')).hexdigest()[:12]
+    return get_limiter(f"api:{digest}", RATE_LIMITS.get('api', DEFAULT_API_RATE))
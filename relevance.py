@@ -0,0 +1,86 @@
+import os
+import re
+import threading
+
+# 酒店行业词表：词 -> 权重；英文词不区分大小写
+DEFAULT_TERMS = {
+    '酒店': 3, '民宿': 3, 'hotel': 3, '宾馆': 3, '客栈': 2,
+    '度假': 2, 'resort': 2, '住宿': 2, '客房': 2, '入住率': 2, 'revpar': 2, '房价': 1,
+    '万豪': 2, '希尔顿': 2, '洲际': 2, '雅高': 2, '凯悦': 2, '锦江': 2, '华住': 2, '首旅': 2, '亚朵': 2,
+    '旅游': 1, '文旅': 1, '景区': 1, '出行': 1,
+}
+# 出现在标题中即视为无关的词
+DEFAULT_EXCLUDE = ['招聘', '讣告', '广告']
+# 达到该分数才视为相关；标题中的命中按 TITLE_WEIGHT 倍计分
+RELEVANCE_MIN_SCORE = float(os.getenv('RELEVANCE_MIN_SCORE', '1'))
+TITLE_WEIGHT = 2
+
+
+def _parse_terms(spec):
+    """解析 RELEVANCE_TERMS，格式如 "酒店=3,邮轮=2,航空=0"，权重为 0 表示从词表中去掉"""
+    terms = {}
+    for part in filter(None, (item.strip() for item in spec.split(','))):
+        term, _, weight = part.partition('=')
+        try:
+            terms[term.strip().lower()] = float(weight or 1)
+        except ValueError:
+            print(f"Ignoring invalid relevance term: {part}")
+    return terms
+
+
+def _parse_exclude(spec):
+    return [term.strip().lower() for term in spec.split(',') if term.strip()]
+
+
+class RelevanceMatcher:
+    """多关键词相关度打分
+
+    所有词编译为一个正则，一次扫描即可累计得分：每个词只计一次，标题命中加倍；
+    标题命中排除词时直接判为无关。
+    """
+
+    def __init__(self, terms=None, exclude=None, min_score=RELEVANCE_MIN_SCORE):
+        self.terms = {term.lower(): weight for term, weight in (terms or DEFAULT_TERMS).items() if weight}
+        self.exclude = set(term.lower() for term in (exclude if exclude is not None else DEFAULT_EXCLUDE))
+        self.min_score = min_score
+        # 长词优先，避免被其前缀截断
+        vocabulary = sorted(set(self.terms) | self.exclude, key=len, reverse=True)
+        self._pattern = re.compile('|'.join(map(re.escape, vocabulary)), re.IGNORECASE) if vocabulary else None
+
+    def _matches(self, text):
+        if not text or self._pattern is None:
+            return set()
+        return {match.group().lower() for match in self._pattern.finditer(text)}
+
+    def score(self, title, content=''):
+        """返回相关度得分，标题命中排除词时为 0"""
+        title_hits = self._matches(title)
+        if title_hits & self.exclude:
+            return 0.0
+        content_hits = self._matches(content) - title_hits
+        return (sum(self.terms.get(term, 0) for term in title_hits) * TITLE_WEIGHT
+                + sum(self.terms.get(term, 0) for term in content_hits))
+
+    def is_relevant(self, title, content=''):
+        return self.score(title, content) >= self.min_score
+
+    def prefilter(self, title):
+        """只看标题的快速预筛：标题中没有任何行业词（或含排除词）的文章不必下载"""
+        return self.score(title) > 0
+
+
+_matcher = None
+_matcher_lock = threading.Lock()
+
+
+def get_relevance_matcher():
+    """获取进程级共享的匹配器，词表可通过 RELEVANCE_TERMS / RELEVANCE_EXCLUDE 调整"""
+    global _matcher
+    with _matcher_lock:
+        if _matcher is None:
+            terms = dict(DEFAULT_TERMS)
+            terms.update(_parse_terms(os.getenv('RELEVANCE_TERMS', '')))
+            exclude_spec = os.getenv('RELEVANCE_EXCLUDE')
+            exclude = _parse_exclude(exclude_spec) if exclude_spec is not None else DEFAULT_EXCLUDE
+            _matcher = RelevanceMatcher(terms, exclude)
+        return _matcher
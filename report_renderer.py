@@ -0,0 +1,155 @@
+from datetime import datetime
+import html
+import re
+
+from news_item import CHINA_TZ
+
+EMPTY_REPORT = "暂无相关新闻"
+REPORT_FOOTER = "更多资讯请访问酒店英语官网：https://www.hotelenglish.cn"
+
+# 模型输出中的加粗标记和标题符号，纯文本中去掉，HTML 中分别转为 <strong> 和 <h3>/<h4>
+EMPHASIS_RE = re.compile(r'\*\*(.+?)\*\*')
+HEADING_RE = re.compile(r'^(#+)\s*')
+
+# 各格式的模板在导入时绑定 str.format，渲染时只做填充
+_MARKDOWN_HEADER = "# {}\n\n".format
+_MARKDOWN_ITEM = "{}. {}\n".format
+_MARKDOWN_SUMMARY = "{}\n".format
+_MARKDOWN_LINK = "[原文链接]({})\n".format
+_MARKDOWN_FOOTER = "------\n\n" + REPORT_FOOTER
+
+_HTML_HEADER = '<h1 class="mb-4">{}</h1>\n'.format
+_HTML_ITEM = '<h3 class="mt-4">{}. {}</h3>\n'.format
+_HTML_SUMMARY = '<p>{}</p>\n'.format
+_HTML_LINK = '<p><a href="{}" target="_blank" rel="noopener" class="text-primary">原文链接</a></p>\n'.format
+_HTML_DIGEST_LINE = '<p class="mb-3">{}</p>\n'.format
+_HTML_DIGEST_HEADING = '<h{0} class="mt-4">{1}</h{0}>\n'.format
+_HTML_FOOTER = '<hr class="my-4">\n<p class="text-muted">{}</p>\n'.format(html.escape(REPORT_FOOTER))
+_HTML_EMPTY = f'<div class="alert alert-info">{EMPTY_REPORT}</div>'
+
+_TEXT_HEADER = "{}\n\n".format
+_TEXT_ITEM = "{}. {}\n".format
+_TEXT_SUMMARY = "{}\n".format
+_TEXT_LINK = "原文链接：{}\n".format
+_TEXT_FOOTER = REPORT_FOOTER
+
+
+def report_title(is_morning=None, now=None):
+    """报告标题，例如 "2024年01月01日早间酒店新闻速报"；未指定早晚时按当前时间判断"""
+    now = now or datetime.now(CHINA_TZ)
+    if is_morning is None:
+        is_morning = now.hour < 12
+    return f"{now:%Y年%m月%d日}{'早间' if is_morning else '晚间'}酒店新闻速报"
+
+
+def markdown_header(title):
+    return _MARKDOWN_HEADER(title)
+
+
+def markdown_footer():
+    return "\n\n" + _MARKDOWN_FOOTER
+
+
+def serialize_news(news):
+    return {
+        'title': news.title,
+        'url': news.url,
+        'summary': news.summary,
+        'source': news.source,
+        'pub_time': news.pub_time.isoformat()
+    }
+
+
+def ensure_rendered(report):
+    """把只有 markdown 文本的报告（旧版保存的早晚报等）转换为各格式的渲染结果"""
+    if isinstance(report, dict):
+        return report
+    text = report or EMPTY_REPORT
+    return {
+        'markdown': text,
+        'html': f'<div style="white-space: pre-wrap">{html.escape(text)}</div>',
+        'text': text,
+        'json': {'title': None, 'digest': text, 'items': [], 'footer': REPORT_FOOTER}
+    }
+
+
+class Report:
+    """一期报告的内容：标题、新闻列表，以及（有 AI 整体摘要时）摘要正文
+
+    有摘要正文时报告展示摘要，新闻列表只出现在 JSON 中；否则逐条列出新闻。
+    """
+
+    __slots__ = ('title', 'items', 'digest')
+
+    def __init__(self, items, title=None, digest=None, is_morning=None):
+        self.items = list(items)
+        self.title = title or report_title(is_morning)
+        self.digest = digest
+
+
+def render(report):
+    """一次遍历同时生成 markdown、HTML、纯文本（微信）和 JSON 四种格式
+
+    返回 {'markdown': str, 'html': str, 'text': str, 'json': dict}，可直接序列化保存。
+    """
+    json_report = {
+        'title': report.title,
+        'digest': report.digest,
+        'items': [],
+        'footer': REPORT_FOOTER
+    }
+    if not report.items and not report.digest:
+        return {'markdown': EMPTY_REPORT, 'html': _HTML_EMPTY, 'text': EMPTY_REPORT, 'json': json_report}
+
+    markdown = [_MARKDOWN_HEADER(report.title)]
+    html_parts = [_HTML_HEADER(html.escape(report.title))]
+    text = [_TEXT_HEADER(report.title)]
+
+    if report.digest:
+        markdown.append(report.digest.strip())
+        markdown.append("\n\n")
+        for line in report.digest.strip().splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            heading = HEADING_RE.match(line)
+            content = line[heading.end():] if heading else line
+            content_html = EMPHASIS_RE.sub(r'<strong>\1</strong>', html.escape(content))
+            if heading:
+                # 报告标题已是 <h1>，摘要中的标题最高为 <h3>，四级及以下为 <h4>
+                level = min(max(len(heading.group(1)), 3), 4)
+                html_parts.append(_HTML_DIGEST_HEADING(level, content_html))
+            else:
+                html_parts.append(_HTML_DIGEST_LINE(content_html))
+            text.append(EMPHASIS_RE.sub(r'\1', content))
+            text.append("\n\n")
+
+    items_json = json_report['items']
+    for i, news in enumerate(report.items, 1):
+        items_json.append(serialize_news(news))
+        if report.digest:
+            continue
+        title = news.title
+        markdown.append(_MARKDOWN_ITEM(i, title))
+        html_parts.append(_HTML_ITEM(i, html.escape(title)))
+        text.append(_TEXT_ITEM(i, title))
+        if news.summary is not None:
+            markdown.append(_MARKDOWN_SUMMARY(news.summary))
+            html_parts.append(_HTML_SUMMARY(html.escape(news.summary)))
+            text.append(_TEXT_SUMMARY(news.summary))
+        if news.url:
+            markdown.append(_MARKDOWN_LINK(news.url))
+            html_parts.append(_HTML_LINK(html.escape(news.url)))
+            text.append(_TEXT_LINK(news.url))
+        markdown.append("\n")
+        text.append("\n")
+
+    markdown.append(_MARKDOWN_FOOTER)
+    html_parts.append(_HTML_FOOTER)
+    text.append(_TEXT_FOOTER)
+    return {
+        'markdown': ''.join(markdown),
+        'html': ''.join(html_parts),
+        'text': ''.join(text),
+        'json': json_report
+    }
@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+import metrics
+
+# /api/news 响应的新鲜期（秒）
+NEWS_CACHE_TTL = int(os.getenv('NEWS_CACHE_TTL', '600'))
+
+
+class _Flight:
+    """一次正在进行的构建，等待者共享其结果"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.error = None
+
+
+class StaleWhileRevalidateCache:
+    """带后台刷新的响应缓存
+
+    - 新鲜期内直接返回缓存
+    - 过期后立即返回旧值，同时只启动一个后台线程重新构建
+    - 没有缓存时，同一个 key 的并发请求只触发一次构建，其余请求等待其结果
+    """
+
+    def __init__(self, ttl=NEWS_CACHE_TTL):
+        self.ttl = ttl
+        self._entries = {}
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, builder):
+        value = self.get_cached(key, builder)
+        if value is not None:
+            return value
+
+        with self._lock:
+            # 其他请求可能刚刚构建完成
+            entry = self._entries.get(key)
+            if entry is not None:
+                return entry[0]
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+        metrics.count(metrics.CACHE_REQUESTS, cache='response', result='miss' if leader else 'coalesced')
+
+        if leader:
+            self._build(key, builder, flight)
+        else:
+            flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        with self._lock:
+            return self._entries[key][0]
+
+    def get_cached(self, key, builder):
+        """返回缓存值（过期时同样返回，并在后台用 builder 刷新），没有缓存时返回 None，不等待构建"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, created_at = entry
+            stale = time.time() - created_at >= self.ttl
+            if stale and key not in self._flights:
+                flight = self._flights[key] = _Flight()
+                threading.Thread(
+                    target=self._build, args=(key, builder, flight), daemon=True
+                ).start()
+        metrics.count(metrics.CACHE_REQUESTS, cache='response', result='stale' if stale else 'hit')
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.time())
+
+    def _build(self, key, builder, flight):
+        try:
+            with metrics.span('build_response', key=key):
+                value = builder()
+            with self._lock:
+                self._entries[key] = (value, time.time())
+        except Exception as e:
+            print(f"Error rebuilding cached response for {key}: {e}")
+            flight.error = e
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
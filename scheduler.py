@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+from storage import data_path
+import json
+import os
+import threading
+import pytz
+
+CHINA_TZ = pytz.timezone('Asia/Shanghai')
+
+# 版本名称 -> 是否为早报
+EDITIONS = {
+    '早报': True,
+    '晚报': False
+}
+
+# 预生成时间（北京时间 HH:MM）
+EDITION_TIMES = {
+    '早报': os.getenv('MORNING_EDITION_TIME', '07:30'),
+    '晚报': os.getenv('EVENING_EDITION_TIME', '17:30')
+}
+
+EDITION_RETRIES = int(os.getenv('EDITION_RETRIES', '3'))
+EDITION_RETRY_DELAY = int(os.getenv('EDITION_RETRY_DELAY', '300'))
+
+
+class EditionScheduler:
+    """按北京时间定时预生成早报和晚报
+
+    builder(is_morning) 负责生成报告：report_renderer 的各格式渲染结果，或 markdown 文本。
+    生成的报告按版本保存在内存和磁盘中，handle_command 和 API 可直接取用，不必重新渲染；
+    某次生成失败时保留上一期报告。失败重试只在定时线程中进行，请求中用 get_or_build，
+    最多生成一次，同一版本的并发请求共用这一次生成。
+    """
+
+    def __init__(self, builder, times=None, path=None, retries=EDITION_RETRIES, retry_delay=EDITION_RETRY_DELAY):
+        self.builder = builder
+        self.times = times or EDITION_TIMES
+        self.path = path or data_path('editions.json')
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._lock = threading.Lock()
+        # 每个版本同时只有一次生成
+        self._build_locks = {name: threading.Lock() for name in EDITIONS}
+        self._stop = threading.Event()
+        self._thread = None
+        self._editions = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._editions, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def get_edition(self, name):
+        """返回最近一次成功生成的报告，没有则返回 None"""
+        with self._lock:
+            edition = self._editions.get(name)
+            return edition['report'] if edition else None
+
+    def _build_locked(self, name):
+        # 调用方持有该版本的 _build_locks
+        report = self.builder(EDITIONS[name])
+        with self._lock:
+            self._editions[name] = {
+                'report': report,
+                'built_at': datetime.now(CHINA_TZ).isoformat()
+            }
+            self._save()
+        print(f"Edition {name} built successfully")
+        return report
+
+    def get_or_build(self, name):
+        """返回当期报告；还没有生成或已过期（早于上一个计划时间）时生成一次，不重试
+
+        没有运行定时线程时（如 Serverless 部署）也能按期更新。并发请求等待同一次生成，
+        不会各自抓取；生成失败时返回上一期，没有上一期则抛出异常。
+        """
+        if not self._is_outdated(name, datetime.now(CHINA_TZ)):
+            return self.get_edition(name)
+        with self._build_locks[name]:
+            # 等待期间其他请求或定时线程可能已经生成
+            if not self._is_outdated(name, datetime.now(CHINA_TZ)):
+                return self.get_edition(name)
+            try:
+                return self._build_locked(name)
+            except Exception as e:
+                previous = self.get_edition(name)
+                if previous is None:
+                    raise
+                print(f"Error building edition {name}, serving previous edition: {e}")
+                return previous
+
+    def build(self, name):
+        """生成指定版本，失败时重试，全部失败则沿用上一期"""
+        for attempt in range(1, self.retries + 1):
+            try:
+                with self._build_locks[name]:
+                    return self._build_locked(name)
+            except Exception as e:
+                print(f"Error building edition {name} (attempt {attempt}/{self.retries}): {e}")
+                if attempt < self.retries and self._stop.wait(self.retry_delay):
+                    break
+
+        print(f"Edition {name} failed, keeping previous edition")
+        return self.get_edition(name)
+
+    def _scheduled_at(self, name, day):
+        hour, minute = (int(part) for part in self.times[name].split(':'))
+        return CHINA_TZ.localize(datetime(day.year, day.month, day.day, hour, minute))
+
+    def _next_run(self, now):
+        candidates = []
+        for name in self.times:
+            run_at = self._scheduled_at(name, now.date())
+            if run_at <= now:
+                run_at = self._scheduled_at(name, now.date() + timedelta(days=1))
+            candidates.append((run_at, name))
+        return min(candidates)
+
+    def _is_outdated(self, name, now):
+        """上一次计划时间之后还没有生成过该版本"""
+        last_run = self._scheduled_at(name, now.date())
+        if last_run > now:
+            last_run = self._scheduled_at(name, now.date() - timedelta(days=1))
+        with self._lock:
+            edition = self._editions.get(name)
+        return edition is None or datetime.fromisoformat(edition['built_at']) < last_run
+
+    def _run(self):
+        # 启动时补齐错过的版本
+        now = datetime.now(CHINA_TZ)
+        for name in self.times:
+            if not self._stop.is_set() and self._is_outdated(name, now):
+                self.build(name)
+
+        while not self._stop.is_set():
+            run_at, name = self._next_run(datetime.now(CHINA_TZ))
+            wait_seconds = (run_at - datetime.now(CHINA_TZ)).total_seconds()
+            print(f"Next edition {name} scheduled at {run_at.strftime('%Y-%m-%d %H:%M')}")
+            if self._stop.wait(max(wait_seconds, 0)):
+                break
+            self.build(name)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name='edition-scheduler', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
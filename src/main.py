@@ -1,9 +1,17 @@
+import sys
+import os
+
+# 添加项目根目录到 Python 路径，以使用共享模块
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
 from scraper import MeadinScraper
 from news_processor import NewsProcessor
 from summarizer import NewsSummarizer
+from scheduler import EditionScheduler, EDITIONS
+from report_renderer import ensure_rendered
+from storage import data_path
 from datetime import datetime
 import pytz
-import os
 
 class NewsAggregator:
     def __init__(self):
@@ -38,16 +46,27 @@ class NewsAggregator:
             # 使用常规格式化
             return self.processor.format_news_report(filtered_news, is_morning)
 
+def build_edition(is_morning):
+    """生成一期早报/晚报，供定时任务调用"""
+    return NewsAggregator().get_news_summary(is_morning=is_morning)
+
+# 定时预生成早报和晚报，在 __main__ 中启动；只含迈点网的报告与 API 的报告分开保存
+scheduler = EditionScheduler(build_edition, path=data_path('editions_cli.json'))
+
 def handle_command(command):
-    aggregator = NewsAggregator()
-    if command == "早报":
-        return aggregator.get_news_summary(is_morning=True)
-    elif command == "晚报":
-        return aggregator.get_news_summary(is_morning=False)
-    else:
+    if command not in EDITIONS:
         return '请发送"早报"或"晚报"获取新闻汇总'
+    
+    # 优先返回预生成的报告，没有时只生成一次，重试留给定时任务
+    try:
+        # 保存的报告可能是 markdown 文本，也可能是各格式的渲染结果
+        return ensure_rendered(scheduler.get_or_build(command))['markdown']
+    except Exception as e:
+        print(f"Error building edition {command}: {e}")
+        return f"{command}生成失败，请稍后再试"
 
 if __name__ == "__main__":
+    scheduler.start()
     while True:
         command = input("请输入命令（早报/晚报）：")
         if command in ["退出", "quit", "exit"]:
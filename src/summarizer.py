@@ -43,8 +43,8 @@ class NewsSummarizer:
         prompt += "新闻内容：\n"
         
         for item in news_items:
-            time_str = item['pub_time'].strftime("%H:%M")
-            prompt += f"[{time_str}] {item['title']}\n"
+            time_str = item.pub_time.strftime("%H:%M")
+            prompt += f"[{time_str}] {item.title}\n"
 
         try:
             response = self.client.chat.completions.create(
@@ -83,8 +83,8 @@ class NewsSummarizer:
         
         summary = f"# {time_str}{period}新闻速报\n\n"
         for i, item in enumerate(news_items, 1):
-            pub_time = item['pub_time'].strftime("%H:%M")
-            summary += f"{i}. [{pub_time}] {item['title']}\n"
+            pub_time = item.pub_time.strftime("%H:%M")
+            summary += f"{i}. [{pub_time}] {item.title}\n"
             
         # 添加网站链接
         summary += "\n更多资讯请访问酒店英语官网：https://www.hotelenglish.cn"
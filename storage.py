@@ -0,0 +1,10 @@
+import os
+
+# 本地持久化数据（缓存、状态文件等）的存放目录，Vercel 等只读环境可指向 /tmp
+DATA_DIR = os.getenv('HOTELNEWS_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.data'))
+
+
+def data_path(filename):
+    """返回数据目录下的文件路径，必要时创建目录"""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, filename)
@@ -1,9 +1,49 @@
 from openai import OpenAI
-from datetime import datetime
-import pytz
 import os
 from dotenv import load_dotenv
 import re
+from llm_executor import get_llm_executor
+from report_renderer import EMPTY_REPORT, Report, markdown_footer, markdown_header, render, report_title
+import metrics
+
+# 模型输出中的 [HH:MM] 时间标记
+TIME_MARK_RE = re.compile(r'\[\d{2}:\d{2}\]\s*')
+# 文本末尾可能尚未接收完整的时间标记
+PARTIAL_TIME_MARK_RE = re.compile(r'\[(\d(\d(:(\d\d?)?)?)?)?$')
+
+
+def strip_time_marks(chunks):
+    """对流式文本片段增量地移除 [HH:MM] 时间标记
+
+    片段末尾可能是被截断的标记，先暂存到下一个片段到达再判断；
+    标记后的空白可能跨片段，也一并去掉。
+    """
+    pending = ''
+    after_mark = False
+    for chunk in chunks:
+        if after_mark:
+            # 上一个片段以完整的时间标记结尾，去掉紧随其后的空白
+            chunk = chunk.lstrip()
+            if not chunk:
+                continue
+            after_mark = False
+        text = pending + chunk
+        pending = ''
+        
+        last_end = None
+        for match in TIME_MARK_RE.finditer(text):
+            last_end = match.end()
+        after_mark = last_end == len(text)
+        text = TIME_MARK_RE.sub('', text)
+        
+        partial = PARTIAL_TIME_MARK_RE.search(text)
+        if partial:
+            text, pending = text[:partial.start()], text[partial.start():]
+        if text:
+            yield text
+    if pending:
+        yield pending
+
 
 class NewsSummarizer:
     def __init__(self):
@@ -25,17 +65,16 @@ class NewsSummarizer:
                 http_client=None,
                 default_headers={
                     "Content-Type": "application/json"
-                }
+                },
+                # 重试由 LLMExecutor 统一处理
+                max_retries=0
             )
         except Exception as e:
             print(f"Error initializing OpenAI client: {e}")
             raise
 
-    def summarize_news(self, news_items):
-        """使用GPT-4对新闻进行摘要"""
-        if not news_items:
-            return "暂无相关新闻"
-
+    def _build_messages(self, news_items):
+        """构建摘要请求的对话消息"""
         # 构建提示词
         prompt = (
             "作为酒店行业资深编辑，请对以下酒店行业新闻进行专业的分析和总结：\n\n"
@@ -53,60 +92,86 @@ class NewsSummarizer:
         
         # 添加新闻内容
         for item in news_items:
-            prompt += f"- {item['title']}\n"
+            prompt += f"- {item.title}\n"
+
+        return [
+            {
+                "role": "system", 
+                "content": (
+                    "你是一位资深的酒店行业分析师和新闻编辑，擅长解读新闻背后的商业逻辑和行业趋势。"
+                    "请用专业的视角分析新闻，并提供深入的见解。每条新闻的总结都应该包含具体的信息和数据。"
+                )
+            },
+            {"role": "user", "content": prompt}
+        ]
+
+    def summarize_news(self, news_items, is_morning=None):
+        """使用GPT-4对新闻进行摘要，返回 markdown 报告"""
+        return self.summarize_report(news_items, is_morning)['markdown']
 
+    def summarize_report(self, news_items, is_morning=None):
+        """生成 AI 整体摘要，返回各格式的渲染结果；摘要失败时退回到逐条列出新闻"""
+        if not news_items:
+            return render(Report([]))
+
+        with metrics.span('summarize_news'):
+            try:
+                # 限流和临时错误会自动退避重试，重试用尽才退回到后备格式
+                response = get_llm_executor().chat(
+                    self.client,
+                    model="gpt-4o-mini",
+                    messages=self._build_messages(news_items),
+                    temperature=0.7,
+                    max_tokens=2000
+                )
+                # 移除模型输出中的时间标记
+                digest = TIME_MARK_RE.sub('', response.choices[0].message.content)
+                
+            except Exception as e:
+                print(f"Error generating summary: {e}")
+                metrics.count(metrics.STAGE_FAILURES, stage='summarize_news')
+                digest = None
+
+        return render(Report(news_items, digest=digest, is_morning=is_morning))
+
+    def summarize_news_stream(self, news_items, is_morning=None):
+        """流式版本的 summarize_news，依次产出标题、模型输出的文本片段和页脚"""
+        if not news_items:
+            yield EMPTY_REPORT
+            return
+
+        title = report_title(is_morning)
+        header = markdown_header(title)
+        yield header
+        
+        started = False
         try:
-            response = self.client.chat.completions.create(
+            stream = get_llm_executor().chat(
+                self.client,
                 model="gpt-4o-mini",
-                messages=[
-                    {
-                        "role": "system", 
-                        "content": (
-                            "你是一位资深的酒店行业分析师和新闻编辑，擅长解读新闻背后的商业逻辑和行业趋势。"
-                            "请用专业的视角分析新闻，并提供深入的见解。每条新闻的总结都应该包含具体的信息和数据。"
-                        )
-                    },
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._build_messages(news_items),
                 temperature=0.7,
-                max_tokens=2000
+                max_tokens=2000,
+                stream=True
+            )
+            chunks = (
+                chunk.choices[0].delta.content
+                for chunk in stream
+                if chunk.choices and chunk.choices[0].delta.content
             )
-            
-            # 获取当前时间和时段
-            current_time = datetime.now(pytz.timezone('Asia/Shanghai'))
-            time_str = current_time.strftime("%Y年%m月%d日")
-            period = "早间" if current_time.hour < 12 else "晚间"
-            
-            # 添加标题
-            summary = f"# {time_str}{period}新闻速报\n\n"
-            
-            # 处理 AI 响应，移除时间标记
-            content = response.choices[0].message.content
-            content = re.sub(r'\[\d{2}:\d{2}\]\s*', '', content)
-            summary += content
-            
-            # 添加网站链接
-            summary += "\n\n更多资讯请访问酒店英语官网：https://www.hotelenglish.cn"
-            
-            return summary
-            
+            for text in strip_time_marks(chunks):
+                started = True
+                yield text
+                
         except Exception as e:
             print(f"Error generating summary: {e}")
-            return self._format_fallback_report(news_items)
-    
-    def _format_fallback_report(self, news_items):
-        """当AI摘要失败时的后备格式化方法"""
-        current_time = datetime.now(pytz.timezone('Asia/Shanghai'))
-        time_str = current_time.strftime("%Y年%m月%d日")
-        period = "早间" if current_time.hour < 12 else "晚间"
+            metrics.count(metrics.STAGE_FAILURES, stage='summarize_news_stream')
+            if started:
+                yield "\n\n（摘要生成中断）"
+            else:
+                # 标题已经输出，只输出后备报告的正文和页脚
+                yield render(Report(news_items, title=title))['markdown'][len(header):]
+                return
         
-        summary = f"# {time_str}{period}新闻速报\n\n"
-        
-        # 直接输出标题，不包含时间
-        for i, item in enumerate(news_items, 1):
-            summary += f"{i}. {item['title']}\n"
-            
         # 添加网站链接
-        summary += "\n更多资讯请访问酒店英语官网：https://www.hotelenglish.cn"
-        
-        return summary 
\ No newline at end of file
+        yield markdown_footer()
@@ -0,0 +1,115 @@
+from storage import data_path
+import hashlib
+import metrics
+import os
+import sqlite3
+import threading
+import time
+
+# 摘要缓存的有效期（秒）和最大条目数
+SUMMARY_CACHE_TTL = int(os.getenv('SUMMARY_CACHE_TTL', str(7 * 24 * 3600)))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.getenv('SUMMARY_CACHE_MAX_ENTRIES', '5000'))
+
+
+class SummaryCache:
+    """基于 SQLite 的文章摘要缓存
+
+    以文章内容、模型和提示词的哈希为键，过期条目在读取时删除，
+    超过容量时按最近访问时间淘汰（LRU）。
+    """
+
+    def __init__(self, path=None, ttl=SUMMARY_CACHE_TTL, max_entries=SUMMARY_CACHE_MAX_ENTRIES):
+        self.path = path or data_path('summary_cache.sqlite3')
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS summaries ("
+                "key TEXT PRIMARY KEY, summary TEXT NOT NULL, "
+                "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_accessed ON summaries (accessed_at)")
+
+    @staticmethod
+    def make_key(content, model, prompt):
+        digest = hashlib.sha256()
+        for part in (model, prompt, content):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def get_many(self, keys):
+        """批量查询，返回命中的 {key: summary}"""
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        now = time.time()
+        found = {}
+        expired = []
+        with self._lock, self._conn:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, summary, created_at FROM summaries WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, summary, created_at in rows:
+                    if now - created_at <= self.ttl:
+                        found[key] = summary
+                    else:
+                        expired.append(key)
+            if expired:
+                self._conn.executemany("DELETE FROM summaries WHERE key = ?", [(key,) for key in expired])
+            if found:
+                self._conn.executemany(
+                    "UPDATE summaries SET accessed_at = ? WHERE key = ?", [(now, key) for key in found]
+                )
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        metrics.count(metrics.CACHE_REQUESTS, len(found), cache='summary', result='hit')
+        metrics.count(metrics.CACHE_REQUESTS, len(keys) - len(found), cache='summary', result='miss')
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def set_many(self, entries):
+        """批量写入 {key: summary}，写入后执行容量淘汰"""
+        if not entries:
+            return
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO summaries (key, summary, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                [(key, summary, now, now) for key, summary in entries.items()]
+            )
+            self._conn.execute(
+                "DELETE FROM summaries WHERE key IN ("
+                "SELECT key FROM summaries ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def set(self, key, summary):
+        self.set_many({key: summary})
+
+    def stats(self):
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+            return {'hits': self.hits, 'misses': self.misses, 'size': size}
+
+
+_summary_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_summary_cache():
+    """获取进程级摘要缓存"""
+    global _summary_cache
+    with _cache_lock:
+        if _summary_cache is None:
+            _summary_cache = SummaryCache()
+        return _summary_cache
@@ -0,0 +1,94 @@
+"""跨来源去重：转载稿归为一簇，标题只差一两个字的不同事件不能合并"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from dedup import CONTENT_PREFIX_CHARS, DedupIndex, Deduplicator
+from news_item import NewsItem
+
+# 标题相近但报道的是不同事件的真实标题对
+NEAR_MISS_TITLES = [
+    ('华住集团发布2024年第一季度财报，营收同比增长18.9%', '华住集团发布2024年第二季度财报，营收同比增长5.2%'),
+    ('亚朵集团2024年第一季度净利润同比增长80%', '亚朵集团2024年第一季度营收同比增长80%'),
+    ('希尔顿旗下华尔道夫酒店在三亚开业', '希尔顿旗下华尔道夫酒店在成都开业'),
+]
+
+
+class DeduplicatorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.index = DedupIndex(os.path.join(self.tmp_dir.name, 'dedup.sqlite3'))
+        self.deduplicator = Deduplicator(self.index)
+        self.next_id = 0
+
+    def tearDown(self):
+        self.index._conn.close()
+        self.tmp_dir.cleanup()
+
+    def news(self, title, source, content=None):
+        self.next_id += 1
+        return NewsItem(title, time.time(), url=f'https://example.com/{self.next_id}', source=source, content=content)
+
+    def test_near_miss_titles_from_other_source_are_kept(self):
+        for title, other in NEAR_MISS_TITLES:
+            with self.subTest(title=title):
+                self.assertFalse(self.deduplicator.is_duplicate(self.news(title, 'meadin')))
+                self.assertFalse(self.deduplicator.is_duplicate(self.news(other, 'traveldaily')))
+
+    def test_near_miss_titles_with_different_content_are_kept(self):
+        for title, other in NEAR_MISS_TITLES:
+            with self.subTest(title=title):
+                first = self.news(title, 'meadin', f'{title}。具体数据以公司公告为准，该事件的详细报道。')
+                second = self.news(other, 'traveldaily', f'{other}。业内人士认为这一变化值得关注，另一则报道。')
+                self.assertFalse(self.deduplicator.is_duplicate(first))
+                self.assertFalse(self.deduplicator.is_duplicate(second))
+
+    def test_reprint_with_same_content_is_duplicate(self):
+        content = '万豪国际集团宣布在上海新开三家酒店，均位于核心商圈，预计年底前全部投入运营，新增客房超过一千间。'
+        self.assertFalse(self.deduplicator.is_duplicate(self.news('万豪国际在上海新开三家酒店', 'meadin', content)))
+        reprint = self.news('独家：万豪上海再落三子', 'traveldaily', '独家：' + content)
+        self.assertTrue(self.deduplicator.is_duplicate(reprint))
+
+    def test_listing_teaser_and_full_reprint_are_duplicate(self):
+        title = '锦江酒店发布会员积分新规'
+        teaser = '锦江酒店今日宣布调整会员积分规则，积分有效期延长至三年。'
+        article = '【环球旅讯】' + '据悉，新规将于下月起实施，覆盖旗下全部中高端品牌，会员可在官方渠道查询积分明细。' * 8
+        self.assertGreaterEqual(len(article), CONTENT_PREFIX_CHARS)
+        self.assertFalse(self.deduplicator.is_duplicate(self.news(title, 'meadin', teaser)))
+        self.assertTrue(self.deduplicator.is_duplicate(self.news(f'独家：{title}', 'traveldaily', article)))
+
+    def test_same_title_with_unrelated_full_articles_is_kept(self):
+        title = '锦江酒店发布会员积分新规'
+        announcement = '锦江酒店今日宣布调整会员积分规则，积分有效期延长至三年，兑换比例保持不变。' * 10
+        commentary = '多位常旅客认为升级门槛明显提高，高端会员权益缩水，部分用户考虑转投其他集团。' * 10
+        self.assertFalse(self.deduplicator.is_duplicate(self.news(title, 'meadin', announcement)))
+        self.assertFalse(self.deduplicator.is_duplicate(self.news(title, 'traveldaily', commentary)))
+
+    def test_same_title_without_content_from_other_source_is_duplicate(self):
+        title = '洲际酒店集团与西安文旅集团签约三个度假项目'
+        self.assertFalse(self.deduplicator.is_duplicate(self.news(title, 'meadin')))
+        self.assertTrue(self.deduplicator.is_duplicate(self.news(f'{title}！', 'traveldaily')))
+
+    def test_same_source_is_never_duplicate(self):
+        content = '凯悦酒店集团在三亚推出全新度假品牌，首批两家酒店将于明年开业。'
+        self.assertFalse(self.deduplicator.is_duplicate(self.news('凯悦在三亚推出全新度假品牌', 'meadin', content)))
+        self.assertFalse(self.deduplicator.is_duplicate(self.news('凯悦三亚推出度假新品牌', 'meadin', content)))
+
+    def test_refetched_news_keeps_its_cluster(self):
+        content = '雅高集团与成都文旅集团签约两个度假项目，总投资约二十亿元。'
+        first = self.news('雅高与成都文旅签约两个度假项目', 'meadin', content)
+        reprint = self.news('独家：雅高成都签约', 'traveldaily', content)
+        self.assertFalse(self.deduplicator.is_duplicate(first))
+        self.assertTrue(self.deduplicator.is_duplicate(reprint))
+        self.assertTrue(self.deduplicator.is_duplicate(reprint))
+        self.assertFalse(self.deduplicator.is_duplicate(first))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,21 @@
+"""Vercel 入口 api/index.py 的导入耗时在预算内，且不在导入阶段加载抓取/摘要相关的重模块"""
+import importlib.util
+import os
+import sys
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from import_time import check
+
+
+@unittest.skipIf(importlib.util.find_spec('flask') is None, 'Flask is not installed')
+class ImportTimeTest(unittest.TestCase):
+
+    def test_api_import_within_budget(self):
+        self.assertTrue(check(), 'api/index.py import exceeded the budget or loaded heavy modules')
+
+
+if __name__ == '__main__':
+    unittest.main()
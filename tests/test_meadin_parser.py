@@ -0,0 +1,65 @@
+"""迈点网列表页各解析后端的结果必须与原始的完整解析（soup）一致"""
+import os
+import sys
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from fixtures import meadin_listing_html
+from meadin_parser import BACKENDS, build_news_items, lxml, parse_listing
+
+AVAILABLE_BACKENDS = [name for name in BACKENDS if name != 'lxml' or lxml is not None]
+
+BOX = (
+    '<div class="news-box clearfix">'
+    '<div class="info"><h3><a data-cut="newtitle" href="/jd/1.html">华住集团发布第二季度财报</a></h3>'
+    '<div class="article">华住集团今日发布财报。</div>'
+    '<p><span class="lf-news">迈点网</span><span class="rf-news">2024-07-01 10:00:00</span></p>'
+    '</div></div>'
+)
+
+EDGE_CASES = {
+    'bare_fragment': BOX,
+    'wrapped_fragment': f'<div class="list">{BOX}{BOX}</div>',
+    'missing_title': BOX.replace(' data-cut="newtitle"', ''),
+    'missing_time': BOX.replace('rf-news', 'other'),
+    'missing_content': BOX.replace('<div class="article">华住集团今日发布财报。</div>', ''),
+    'similar_class_names': BOX.replace('news-box clearfix', 'news-boxes') + BOX.replace('news-box', 'big-news-box'),
+    'nested_markup': BOX.replace('华住集团发布第二季度财报', '<em>华住</em>集团发布 第二季度财报 '),
+    'entities': BOX.replace('华住集团今日发布财报。', '营收&amp;利润双增长&nbsp;'),
+    'xml_declaration': '<?xml version="1.0" encoding="utf-8"?><html><body>' + BOX + '</body></html>',
+    'no_news': '<html><body><div class="list"></div></body></html>',
+}
+
+
+class ParserParityTest(unittest.TestCase):
+
+    def assert_parity(self, html):
+        reference = parse_listing(html, 'soup')
+        for name in AVAILABLE_BACKENDS:
+            with self.subTest(backend=name):
+                self.assertEqual(parse_listing(html, name), reference)
+        return reference
+
+    def test_fixture_listing(self):
+        entries = self.assert_parity(meadin_listing_html(count=40))
+        self.assertEqual(len(entries), 40)
+        self.assertEqual(len(build_news_items(entries)), 40)
+
+    def test_edge_cases(self):
+        for case, html in EDGE_CASES.items():
+            with self.subTest(case=case):
+                self.assert_parity(html)
+
+    def test_bare_fragment_is_parsed(self):
+        for name in AVAILABLE_BACKENDS:
+            with self.subTest(backend=name):
+                entries = parse_listing(BOX, name)
+                self.assertEqual(len(entries), 1)
+                self.assertEqual(entries[0]['href'], '/jd/1.html')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+"""AI 整体摘要中的 markdown 标题和加粗标记在 HTML 和纯文本中的渲染"""
+import os
+import sys
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from report_renderer import Report, render
+
+DIGEST = """### 行业动态
+**华住集团**发布第二季度财报。
+
+#### 海外市场 & 投资
+万豪在东南亚新开三家酒店。
+"""
+
+
+class DigestRenderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.rendered = render(Report([], title='测试报告', digest=DIGEST))
+
+    def test_headings_in_html(self):
+        html = self.rendered['html']
+        self.assertIn('<h3 class="mt-4">行业动态</h3>', html)
+        self.assertIn('<h4 class="mt-4">海外市场 &amp; 投资</h4>', html)
+        self.assertIn('<p class="mb-3"><strong>华住集团</strong>发布第二季度财报。</p>', html)
+        self.assertNotIn('#', html)
+
+    def test_heading_levels_are_bounded(self):
+        html = render(Report([], title='测试报告', digest='# 一级\n###### 六级'))['html']
+        self.assertIn('<h3 class="mt-4">一级</h3>', html)
+        self.assertIn('<h4 class="mt-4">六级</h4>', html)
+
+    def test_markup_stripped_from_text(self):
+        text = self.rendered['text']
+        self.assertIn('行业动态\n\n华住集团发布第二季度财报。\n\n海外市场 & 投资\n\n', text)
+        self.assertNotIn('#', text)
+        self.assertNotIn('**', text)
+
+    def test_markdown_keeps_digest(self):
+        self.assertIn(DIGEST.strip(), self.rendered['markdown'])
+
+
+if __name__ == '__main__':
+    unittest.main()
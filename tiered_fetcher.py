@@ -0,0 +1,217 @@
+from async_fetcher import get_async_fetcher
+from rate_limiter import limiter_for_url
+from storage import data_path
+from urllib.parse import urlsplit
+import json
+import os
+import re
+import threading
+import metrics
+
+# 浏览器层的实现：selenium（默认）、playwright，或 none（只用 HTTP，如 Serverless 环境）
+BROWSER_BACKEND = os.getenv('FETCH_BROWSER_BACKEND', 'selenium')
+# 已确认 HTTP 可用的 URL 模式，连续多少次缺少预期内容后再用浏览器核实一次
+HTTP_MISS_LIMIT = int(os.getenv('FETCH_HTTP_MISS_LIMIT', '5'))
+# 需要浏览器的 URL 模式，每隔多少次重新尝试一次 HTTP（站点可能改为服务端渲染）
+HTTP_RETRY_EVERY = int(os.getenv('FETCH_HTTP_RETRY_EVERY', '20'))
+# 浏览器中等待预期元素的超时（秒）
+BROWSER_WAIT_SECONDS = 15
+
+DIGITS_RE = re.compile(r'\d+')
+
+
+def url_pattern(url):
+    """URL 所属的模式：主机名 + 路径，路径中的数字替换为 {id}，如 www.traveldaily.cn/article/{id}"""
+    parts = urlsplit(url)
+    return parts.netloc + (DIGITS_RE.sub('{id}', parts.path) or '/')
+
+
+class TierMemory:
+    """记录每个 URL 模式上次成功使用的抓取层（http / browser），持久化到数据目录
+
+    抓取层变化时立即保存；计数（连续缺少 marker 的次数、使用浏览器的次数）只在内存中累加，
+    由 flush() 在一批页面抓取完成后一并保存。
+    """
+
+    def __init__(self, path=None):
+        self.path = path or data_path('fetch_tiers.json')
+        self._lock = threading.Lock()
+        self._patterns = self._load()
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._patterns, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def flush(self):
+        """保存尚未写入的计数"""
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def use_http(self, url):
+        """是否先尝试 HTTP：未知或 HTTP 可用的模式总是先用 HTTP，需要浏览器的模式定期重试一次"""
+        pattern = url_pattern(url)
+        with self._lock:
+            state = self._patterns.get(pattern)
+            if state is None or state['tier'] == 'http':
+                return True
+            state['browser_runs'] = state.get('browser_runs', 0) + 1
+            self._dirty = True
+            return state['browser_runs'] % HTTP_RETRY_EVERY == 0
+
+    def needs_browser(self, url, html, marker):
+        """判断 HTTP 返回的页面是否需要交给浏览器，并更新该模式的记录
+
+        请求失败（html 为 None）或页面不存在（空字符串）时浏览器也无济于事，不升级；
+        页面包含 marker 时记为 HTTP 可用。
+        缺少 marker 时，已确认 HTTP 可用的模式视为页面本身没有内容（如文章已删除），
+        连续缺少 HTTP_MISS_LIMIT 次后才用浏览器核实；其余模式交给浏览器。
+        """
+        if not html:
+            return False
+        pattern = url_pattern(url)
+        with self._lock:
+            state = self._patterns.get(pattern)
+            if marker in html:
+                if state != {'tier': 'http', 'misses': 0}:
+                    self._patterns[pattern] = {'tier': 'http', 'misses': 0}
+                    self._save()
+                return False
+            if state is not None and state['tier'] == 'http' and state['misses'] + 1 < HTTP_MISS_LIMIT:
+                state['misses'] += 1
+                self._dirty = True
+                return False
+            return True
+
+    def record_browser(self, url, html, marker):
+        """记录浏览器的结果：浏览器拿到了 marker 说明页面需要 JS，否则页面本身就没有该内容"""
+        if not html:
+            return
+        tier = 'browser' if marker in html else 'http'
+        with self._lock:
+            self._patterns[url_pattern(url)] = {'tier': tier, 'misses': 0}
+            self._save()
+
+
+_tier_memory = None
+_memory_lock = threading.Lock()
+
+
+def get_tier_memory():
+    """获取进程级共享的抓取层记录"""
+    global _tier_memory
+    with _memory_lock:
+        if _tier_memory is None:
+            _tier_memory = TierMemory()
+        return _tier_memory
+
+
+def _fetch_selenium(urls, marker, labels):
+    from selenium.common.exceptions import TimeoutException, WebDriverException
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+    from browser_pool import get_browser_pool
+
+    pages = {}
+    with get_browser_pool().driver() as driver:
+        for url in urls:
+            limiter_for_url(url).acquire()
+            try:
+                with metrics.span('page_load', fetcher='selenium', **labels):
+                    driver.get(url)
+                try:
+                    with metrics.span('page_wait', fetcher='selenium', **labels):
+                        WebDriverWait(driver, BROWSER_WAIT_SECONDS).until(
+                            EC.presence_of_element_located((By.CLASS_NAME, marker))
+                        )
+                except TimeoutException:
+                    print(f"Timed out waiting for .{marker} at {url}")
+                pages[url] = driver.page_source
+            except WebDriverException as e:
+                print(f"Error fetching {url} with Selenium: {e}")
+                pages[url] = None
+    return pages
+
+
+def _fetch_playwright(urls, marker, labels):
+    from browser_pool import get_playwright_pool
+    return get_playwright_pool().fetch_all(urls, wait_selector=f'.{marker}', **labels)
+
+
+BROWSER_BACKENDS = {
+    'selenium': _fetch_selenium,
+    'playwright': _fetch_playwright
+}
+
+
+class TieredFetcher:
+    """分层抓取：先用普通 HTTP 请求，页面缺少预期的元素（marker，CSS 类名）时才用无头浏览器
+
+    每个 URL 模式上次成功的抓取层记录在 TierMemory 中，已知需要浏览器的页面直接用浏览器，
+    大部分页面不必启动浏览器。
+    """
+
+    def __init__(self, browser_backend=None, http_fetcher=None, memory=None):
+        self.browser_backend = browser_backend or BROWSER_BACKEND
+        self.http_fetcher = http_fetcher or get_async_fetcher()
+        self.memory = memory or get_tier_memory()
+
+    @property
+    def has_browser(self):
+        return self.browser_backend in BROWSER_BACKENDS
+
+    def use_http(self, url):
+        return not self.has_browser or self.memory.use_http(url)
+
+    def needs_browser(self, url, html, marker):
+        return self.has_browser and self.memory.needs_browser(url, html, marker)
+
+    def flush(self):
+        self.memory.flush()
+
+    def fetch_browser(self, urls, marker, **labels):
+        """用浏览器打开页面并等待 marker 出现，返回 {url: html}，失败的 URL 对应 None"""
+        urls = list(urls)
+        if not urls:
+            return {}
+        metrics.count(metrics.FETCH_TIER, len(urls), tier=self.browser_backend, **labels)
+        try:
+            pages = BROWSER_BACKENDS[self.browser_backend](urls, marker, labels)
+        except Exception as e:
+            print(f"Error fetching with {self.browser_backend}: {e}")
+            return {url: None for url in urls}
+        for url in urls:
+            self.memory.record_browser(url, pages.get(url), marker)
+        return pages
+
+    def fetch_all(self, urls, marker, **labels):
+        """按各 URL 模式记录的抓取层获取页面，返回 {url: html}，失败的 URL 对应 None，不存在的页面对应空字符串"""
+        urls = list(urls)
+        http_urls = [url for url in urls if self.use_http(url)]
+        http_set = set(http_urls)
+        browser_urls = [url for url in urls if url not in http_set]
+
+        pages = {}
+        if http_urls:
+            metrics.count(metrics.FETCH_TIER, len(http_urls), tier='http', **labels)
+            with metrics.span('page_load', fetcher='http', **labels):
+                pages.update(self.http_fetcher.fetch_all(http_urls))
+            browser_urls += [url for url in http_urls if self.needs_browser(url, pages.get(url), marker)]
+        if browser_urls:
+            print(f"Fetching {len(browser_urls)} pages with {self.browser_backend}")
+            pages.update(self.fetch_browser(browser_urls, marker, **labels))
+        self.flush()
+        return pages
+
@@ -1,145 +1,264 @@
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
 from bs4 import BeautifulSoup
-from datetime import datetime
-import pytz
-import time
-import random
-from openai import OpenAI
-from dotenv import load_dotenv
 import os
+import json
+import re
+from ai_summarizer import summarize_items
+from news_item import NewsItem
+from relevance import get_relevance_matcher
+from storage import data_path
+from tiered_fetcher import TieredFetcher
+import metrics
 
-# 加载环境变量
-load_dotenv()
-
-class AISummarizer:
-    def __init__(self):
-        self.client = OpenAI(
-            api_key=os.getenv("OPENAI_API_KEY"),
-            base_url=os.getenv("OPENAI_BASE_URL")
-        )
-
-    def generate_summary(self, content):
-        try:
-            time.sleep(2)  # 增加延迟以避免 API 限制
-            response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": "你是一个专业的新闻摘要生成器，请用50字以内概括新闻内容"},
-                    {"role": "user", "content": f"请为以下新闻生成摘要：\n{content}"}
-                ],
-                max_tokens=60
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            print(f"Error generating summary: {e}")
-            return "暂无摘要"
+# 文章链接中的数字ID
+ARTICLE_LINK_RE = re.compile(r'/article/(\d+)')
+# 首页中指向文章的链接及其文字，用于按标题预筛
+ARTICLE_ANCHOR_RE = re.compile(r'<a\b[^>]*href="[^"]*/article/(\d+)[^"]*"[^>]*>(.*?)</a>', re.S | re.I)
+TAG_RE = re.compile(r'<[^>]+>')
+# 文章页就绪的标志：标题的 CSS 类名
+ARTICLE_MARKER = 'articleTitle'
+# 列表页和历史记录都不可用时，向后探测的起点
+SEED_ARTICLE_ID = 185571
+# 首次运行时抓取最新的多少篇；每次运行最多抓取多少篇
+INITIAL_WINDOW = 10
+MAX_ARTICLES_PER_RUN = int(os.getenv('TRAVELDAILY_MAX_ARTICLES', '30'))
+# 最多记住多少篇高水位以下尚未处理的文章（下载失败、超出单次上限、调用方提前停止），留待以后补抓
+MAX_PENDING_ARTICLES = 100
+# 下载失败的文章最多重试的次数，之后放弃
+MAX_ARTICLE_FAILURES = int(os.getenv('TRAVELDAILY_MAX_FAILURES', '3'))
+# 探测时容忍的连续空号（被删除的文章）数量
+PROBE_GAP = 3
+# 每批并发下载的文章数
+ARTICLE_BATCH_SIZE = 5
+# 是否按首页上的标题跳过明显无关的文章（不下载、不生成摘要）
+TITLE_PREFILTER = os.getenv('TRAVELDAILY_TITLE_PREFILTER', '1') == '1'
 
 class TravelDailyScraper:
     def __init__(self):
         self.base_url = "https://www.traveldaily.cn"
+        # 文章页先用 HTTP 下载，缺少文章标题时才用浏览器
+        self.fetcher = TieredFetcher()
+        self.matcher = get_relevance_matcher()
+        # 首页上看到的文章标题 {文章ID: 标题}
+        self.listing_titles = {}
+        # 记录已处理过的最大文章ID（高水位）以及其下尚未处理的文章ID
+        self.state_path = data_path('traveldaily_state.json')
+
+    def _article_url(self, article_id):
+        return f"{self.base_url}/article/{article_id}"
+
+    def _load_state(self):
+        """返回 (高水位, 待补抓的文章 {ID: 已失败次数})，没有记录时高水位为 None"""
         try:
-            chrome_path = r"D:\电脑工具\Chrome\App\chrome.exe"
-            print(f"TravelDaily: Chrome browser found at: {chrome_path}")
-            
-            options = webdriver.ChromeOptions()
-            options.add_argument('--headless')
-            options.add_argument('--disable-gpu')
-            options.add_argument('--no-sandbox')
-            options.add_argument('--disable-dev-shm-usage')
-            options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36')
-            options.binary_location = chrome_path
-            
-            service = Service(ChromeDriverManager().install())
-            self.driver = webdriver.Chrome(service=service, options=options)
-            print("TravelDaily: Chrome WebDriver initialized successfully")
-            
-        except Exception as e:
-            print(f"TravelDaily: Error initializing Chrome WebDriver: {e}")
-            raise
+            with open(self.state_path, encoding='utf-8') as f:
+                state = json.load(f)
+            pending = state.get('pending', {})
+            # 旧版本只记录了ID列表
+            if isinstance(pending, list):
+                pending = dict.fromkeys(pending, 0)
+            return int(state['high_water']), {int(article_id): int(failures) for article_id, failures in pending.items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None, {}
+
+    def _save_state(self, high_water, pending):
+        kept = sorted(pending, reverse=True)[:MAX_PENDING_ARTICLES]
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'high_water': high_water, 'pending': {str(i): pending[i] for i in kept}}, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _save_progress(self, high_water, pending, processed, failed):
+        """记录一批文章的结果并保存，返回新的高水位
+
+        processed 中的文章（包括已不存在的）不再抓取；failed 中的文章失败次数加一，
+        达到 MAX_ARTICLE_FAILURES 次后放弃，同样不再抓取。
+        """
+        processed = list(processed)
+        for article_id in failed:
+            pending[article_id] = pending.get(article_id, 0) + 1
+            if pending[article_id] >= MAX_ARTICLE_FAILURES:
+                print(f"TravelDaily: Giving up on article {article_id} after {pending[article_id]} failures")
+                processed.append(article_id)
+        for article_id in processed:
+            pending.pop(article_id, None)
+        high_water = max([high_water] + processed)
+        self._save_state(high_water, pending)
+        return high_water
+
+    def _discover_from_listing(self):
+        """从首页的文章链接中找出最新的文章ID"""
+        # 首页只用来找文章链接，不需要浏览器
+        html = self.fetcher.http_fetcher.fetch_all([self.base_url]).get(self.base_url)
+        if not html:
+            return None
+        article_ids = [int(article_id) for article_id in ARTICLE_LINK_RE.findall(html)]
+        for article_id, text in ARTICLE_ANCHOR_RE.findall(html):
+            title = ' '.join(TAG_RE.sub(' ', text).split())
+            # 同一篇文章可能有图片链接和文字链接，保留较长的文字
+            if len(title) > len(self.listing_titles.get(int(article_id), '')):
+                self.listing_titles[int(article_id)] = title
+        return max(article_ids) if article_ids else None
+
+    def _probe(self, article_id):
+        """article_id 起的 PROBE_GAP 个ID中存在的最大ID，都不存在时返回 None"""
+        urls = {self._article_url(i): i for i in range(article_id, article_id + PROBE_GAP)}
+        # 探测的大多是还不存在的ID，只用 HTTP：这些空页面不能算作 HTTP 缺少内容而升级到浏览器
+        pages = self.fetcher.http_fetcher.fetch_all(list(urls))
+        existing = [i for url, i in urls.items() if pages.get(url) and ARTICLE_MARKER in pages[url]]
+        return max(existing) if existing else None
+
+    def _gallop_newest(self, start):
+        """从已知存在的 start 开始指数步长向后探测，再二分查找最新的文章ID"""
+        low, step = start, 1
+        while True:
+            high = low + step
+            found = self._probe(high)
+            if found is None:
+                break
+            low, step = found, step * 2
+
+        # low 存在，high 起的窗口不存在
+        while high - low > 1:
+            middle = (low + high) // 2
+            found = self._probe(middle)
+            if found is None:
+                high = middle
+            else:
+                low = max(low, found)
+                if found >= high:
+                    break
+        return low
+
+    def _discover_new_ids(self):
+        """返回尚未处理的文章 {ID: 已失败次数}（高水位之上的新文章加上待补抓的）以及当前的高水位
+
+        首次运行时只取最新的 INITIAL_WINDOW 篇，高水位从其下方开始。
+        """
+        high_water, pending = self._load_state()
+        newest = self._discover_from_listing()
+        if newest is None:
+            print("TravelDaily: Listing unavailable, probing article IDs")
+            newest = self._gallop_newest(high_water or SEED_ARTICLE_ID)
+        
+        if high_water is None:
+            high_water = newest - INITIAL_WINDOW
+        for article_id in range(newest, high_water, -1):
+            pending.setdefault(article_id, 0)
+        return pending, high_water
+
+    def _parse_article(self, html):
+        """从静态 HTML 中解析文章标题、正文和发布时间"""
+        soup = BeautifulSoup(html, 'html.parser')
+        title_elem = soup.find(class_='articleTitle')
+        if not title_elem:
+            return None
+        
+        content_elem = soup.find(class_='articleContent')
+        time_elem = soup.find(class_='articleTime')
+        
+        title = title_elem.get_text(strip=True)
+        content = content_elem.get_text('\n', strip=True) if content_elem else ""
+        time_str = time_elem.get_text(strip=True) if time_elem else ""
+        return title, content, time_str
+
+    def _build_item(self, article_url, html):
+        """由文章页面构建新闻条目，页面缺失或与酒店无关时返回 None"""
+        if not html:
+            return None
+        
+        with metrics.span('parse', source='TravelDailyScraper'):
+            parsed = self._parse_article(html)
+        if not parsed:
+            print(f"TravelDaily: No article title found in {article_url}")
+            return None
+        title, content, time_str = parsed
+        
+        # 检查是否是酒店相关新闻
+        if not self.matcher.is_relevant(title, content):
+            return None
+        
+        # 发布时间缺失时以当前时间代替
+        news = NewsItem.from_time_str(title, time_str, url=article_url, content=content)
+        print(f"TravelDaily: Added news: {title[:30]}...")
+        return news
+
+    def _prefilter(self, article_ids):
+        """跳过首页标题明显与酒店无关的文章；首页上没有的文章无法判断，照常下载"""
+        kept = []
+        for article_id in article_ids:
+            title = self.listing_titles.get(article_id)
+            if title and not self.matcher.prefilter(title):
+                print(f"TravelDaily: Skipping irrelevant article {article_id}: {title[:30]}")
+                continue
+            kept.append(article_id)
+        return kept
 
     def get_news(self):
+        news_items = list(self.iter_news())
+        
+        # 批量生成摘要
+        summarize_items(news_items)
+        
+        print(f"TravelDaily: Successfully collected {len(news_items)} news items")
+        return news_items
+
+    def iter_news(self):
+        """按发布时间从新到旧逐条产出新闻，不生成摘要（正文保存在 content 中）
+
+        文章按ID从新到旧分批并发下载，调用方停止迭代后不再下载后续批次。
+        每批新闻全部交给调用方后才记为已处理并保存进度；已不存在的文章（404/410）同样算作已处理。
+        下载失败、超出单次上限或调用方提前停止而没有处理的文章留待下次补抓，
+        失败 MAX_ARTICLE_FAILURES 次后放弃。
+        """
+        try:
+            # 找出上次处理之后新发布的文章ID
+            pending, high_water = self._discover_new_ids()
+        except Exception as e:
+            print(f"TravelDaily: Error discovering articles: {e}")
+            return
+        if not pending:
+            print("TravelDaily: No new articles since last run")
+            return
+        article_ids = sorted(pending, reverse=True)[:MAX_ARTICLES_PER_RUN]
+        print(f"TravelDaily: Found {len(pending)} unprocessed article IDs, fetching {len(article_ids)}")
+        # 尚未保存进度的文章ID；按标题跳过的文章不下载，同样算作已处理
+        processed, failed = [], []
+        if TITLE_PREFILTER:
+            fetch_ids = self._prefilter(article_ids)
+            processed = sorted(set(article_ids) - set(fetch_ids))
+            article_ids = fetch_ids
+        if not article_ids and processed:
+            self._save_progress(high_water, pending, processed, failed)
+        
         try:
-            # 预定义一些最新的文章ID
-            # 这些ID可以通过观察网站最新文章来确定
-            article_ids = [
-                "185571", "185570", "185569", "185568", "185567",
-                "185566", "185565", "185564", "185563", "185562"
-            ]
-            
-            news_items = []
-            for article_id in article_ids:
-                try:
-                    article_url = f"{self.base_url}/article/{article_id}"
-                    print(f"TravelDaily: Processing article: {article_url}")
-                    
-                    # 访问文章页面
-                    self.driver.get(article_url)
-                    
-                    # 等待文章内容加载
-                    WebDriverWait(self.driver, 5).until(
-                        EC.presence_of_element_located((By.CLASS_NAME, "articleTitle"))
-                    )
-                    
-                    # 获取标题和内容
-                    title = self.driver.find_element(By.CLASS_NAME, "articleTitle").text.strip()
-                    content = self.driver.find_element(By.CLASS_NAME, "articleContent").text.strip()
-                    
-                    # 检查是否是酒店相关新闻
-                    if not any(keyword in title.lower() or keyword in content.lower() 
-                             for keyword in ['酒店', '度假', '旅游', '民宿', 'hotel']):
+            for start in range(0, len(article_ids), ARTICLE_BATCH_SIZE):
+                # 并发下载一批文章页面
+                batch = article_ids[start:start + ARTICLE_BATCH_SIZE]
+                article_urls = {article_id: self._article_url(article_id) for article_id in batch}
+                pages = self.fetcher.fetch_all(article_urls.values(), ARTICLE_MARKER, source='TravelDailyScraper')
+                
+                batch_items = []
+                for article_id, article_url in article_urls.items():
+                    html = pages.get(article_url)
+                    if html is None:
+                        # 下载失败，下次重试
+                        failed.append(article_id)
                         continue
-                    
-                    # 获取发布时间
+                    processed.append(article_id)
                     try:
-                        time_str = self.driver.find_element(By.CLASS_NAME, "articleTime").text.strip()
-                        if len(time_str) == 10:  # 格式: YYYY-MM-DD
-                            time_str += ' 00:00:00'
-                    except:
-                        time_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    
-                    # 解析时间
-                    pub_time = datetime.strptime(time_str, '%Y-%m-%d %H:%M:%S')
-                    china_tz = pytz.timezone('Asia/Shanghai')
-                    pub_time = china_tz.localize(pub_time)
-                    
-                    # 生成摘要
-                    summarizer = AISummarizer()
-                    summary = summarizer.generate_summary(content)
-                    
-                    news_items.append({
-                        'title': title,
-                        'pub_time': pub_time,
-                        'summary': summary,
-                        'url': article_url
-                    })
-                    print(f"TravelDaily: Added news: {title[:30]}...")
-                    
-                    # 短暂延迟
-                    time.sleep(0.5)
-                    
-                except Exception as e:
-                    print(f"TravelDaily: Error processing article {article_id}: {e}")
-                    continue
-            
-            print(f"TravelDaily: Successfully collected {len(news_items)} news items")
-            return news_items
-            
+                        print(f"TravelDaily: Processing article: {article_url}")
+                        news = self._build_item(article_url, html)
+                        if news:
+                            batch_items.append(news)
+                    except Exception as e:
+                        print(f"TravelDaily: Error processing article {article_id}: {e}")
+                        continue
+                
+                batch_items.sort(key=lambda x: x.ts, reverse=True)
+                yield from batch_items
+                
+                # 调用方已取走本批新闻，更新进度；生成器被提前关闭时不会执行到这里
+                high_water = self._save_progress(high_water, pending, processed, failed)
+                processed, failed = [], []
+                
         except Exception as e:
             print(f"TravelDaily: Error scraping news: {e}")
-            return []
-            
-        finally:
-            time.sleep(1)
-
-    def __del__(self):
-        try:
-            if hasattr(self, 'driver'):
-                self.driver.quit()
-                print("TravelDaily: Chrome WebDriver closed successfully")
-        except Exception as e:
-            print(f"TravelDaily: Error closing Chrome WebDriver: {e}")